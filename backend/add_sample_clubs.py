@@ -1,50 +1,40 @@
-from app.utils.db import get_db_connection
-from datetime import datetime
+from app.utils.db import get_db
+from app.utils.migrations import migrate
 
 def add_sample_clubs():
-    conn, cur = get_db_connection()
-    
-    # Create table if it doesn't exist
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS Clubs(
-            club_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            club_name VARCHAR(50) NOT NULL,
-            description TEXT,
-            created_at TEXT,
-            member_count INTEGER DEFAULT 0
-        )
-    """)
-    
+    # Make sure the schema is current before inserting
+    migrate()
+    conn = get_db()
+    cur = conn.cursor()
+
     # Check if clubs already exist
     cur.execute("SELECT COUNT(*) FROM Clubs")
     count = cur.fetchone()[0]
-    
+
     if count == 0:
         # Add sample clubs
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         sample_clubs = [
-            ("Tech Club", "A club for technology enthusiasts and developers", now, 25),
-            ("Cultural Committee", "Organizing cultural events and festivals", now, 40),
-            ("Sports Club", "For sports and fitness activities", now, 30),
-            ("Photography Club", "Capturing moments and learning photography", now, 15),
-            ("Music Club", "For music lovers and performers", now, 20),
-            ("Drama Club", "Theater and drama performances", now, 18),
-            ("Environmental Club", "Promoting environmental awareness", now, 22),
-            ("Literature Club", "Book discussions and writing workshops", now, 12)
+            ("Tech Club", "A club for technology enthusiasts and developers", "https://example.com/logos/tech.png"),
+            ("Cultural Committee", "Organizing cultural events and festivals", "https://example.com/logos/cultural.png"),
+            ("Sports Club", "For sports and fitness activities", "https://example.com/logos/sports.png"),
+            ("Photography Club", "Capturing moments and learning photography", "https://example.com/logos/photography.png"),
+            ("Music Club", "For music lovers and performers", "https://example.com/logos/music.png"),
+            ("Drama Club", "Theater and drama performances", "https://example.com/logos/drama.png"),
+            ("Environmental Club", "Promoting environmental awareness", "https://example.com/logos/environment.png"),
+            ("Literature Club", "Book discussions and writing workshops", "https://example.com/logos/literature.png")
         ]
-        
+
         cur.executemany(
-            "INSERT INTO Clubs (club_name, description, created_at, member_count) VALUES (?, ?, ?, ?)",
+            "INSERT INTO Clubs (name, description, logo_url) VALUES (?, ?, ?)",
             sample_clubs
         )
-        
+
         print(f"Added {len(sample_clubs)} sample clubs to the database")
     else:
         print(f"Clubs table already has {count} clubs")
-    
+
     conn.commit()
-    conn.close()
 
 if __name__ == "__main__":
     add_sample_clubs()
-    print("Sample clubs added successfully!")
\ No newline at end of file
+    print("Sample clubs added successfully! For scale datasets use generate_data.py.")
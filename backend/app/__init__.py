@@ -2,6 +2,7 @@ from flask import Flask, jsonify, session
 from flask_cors import CORS
 from .routes import register_routes
 from .utils.election_scheduler import start_scheduler
+from .utils import db, json_provider, metrics, migrations, password_pool
 
 def create_app():
     app = Flask(__name__)
@@ -15,6 +16,12 @@ def create_app():
         SESSION_COOKIE_NAME="session",
     )
 
+    metrics.init_app(app)
+    json_provider.init_app(app)
+    db.init_app(app)
+    with app.app_context():
+        migrations.migrate()
+    password_pool.start()
     start_scheduler()
 
     # --- CORS Config ---
@@ -26,25 +33,21 @@ def create_app():
             "http://localhost:3000"
         ]}},
         supports_credentials=True,
-        allow_headers=["Content-Type"]
+        allow_headers=["Content-Type"],
+        expose_headers=["X-Next-Cursor"]
     )
 
     # --- Session Check Endpoint ---
     @app.route("/me", methods=["GET"])
     def me():
-        from .models.user_model import get_user_by_reg_no, get_user_role
+        from .services.auth_service import session_user_service, public_user
 
         if "reg_no" in session:
-            user_data = get_user_by_reg_no(session["reg_no"])
-            if user_data:
-                user_role = get_user_role(session["reg_no"]) or "user"  # Default to 'user' if no role found
-                return jsonify({
-                    "user": {
-                        "reg_no": user_data[0],
-                        "name": user_data[2],
-                        "role": user_role
-                    }
-                }), 200
+            claims = session_user_service(session["reg_no"], session.get("claims"))
+            if claims:
+                if claims is not session.get("claims"):
+                    session["claims"] = claims
+                return jsonify({"user": public_user(claims)}), 200
 
         return jsonify({"user": None}), 200
     
@@ -1,25 +1,43 @@
-from ..utils.db import get_db_connection
+from ..utils.db import get_db, fetch_dicts
+from ..utils.metrics import instrument_module
+from ..utils import tally_cache
 
 
 def create_candidate(election_id, reg_no, manifesto=None):
-    conn, cur = get_db_connection()
+    conn = get_db()
     try:
-        cur.execute("""
+        conn.execute("""
             INSERT INTO Candidates (election_id, reg_no, manifesto)
             VALUES (?, ?, ?)
         """, (election_id, reg_no, manifesto))
         conn.commit()
+        tally_cache.invalidate(election_id)
         return True
     except Exception as e:
+        conn.rollback()
         print("Error creating candidate:", e)
         return False
-    finally:
-        conn.close()
+
+
+def get_tally_version(election_id):
+    conn = get_db()
+    row = conn.execute("SELECT version FROM TallyVersions WHERE election_id = ?", (election_id,)).fetchone()
+    return row[0] if row else 0
 
 
 def get_candidates_by_election(election_id):
-    conn, cur = get_db_connection()
-    cur.execute("""
+    """
+    Returns the election's candidates sorted by total_votes, served from the
+    in-process tally cache whenever it is current.
+    """
+    return tally_cache.get_sorted_candidates(
+        election_id, get_tally_version, query_candidates_by_election
+    )
+
+
+def query_candidates_by_election(election_id):
+    conn = get_db()
+    cur = conn.execute("""
         SELECT
             c.candidate_id,
             c.election_id,
@@ -30,16 +48,14 @@ def get_candidates_by_election(election_id):
         FROM Candidates c
         JOIN Users u ON c.reg_no = u.reg_no
         WHERE c.election_id = ?
-        ORDER BY c.total_votes DESC
+        ORDER BY c.total_votes DESC, c.candidate_id
     """, (election_id,))
-    candidates = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return candidates
+    return fetch_dicts(cur)
 
 
 def get_candidate_by_candidate_id(candidate_id):
-    conn, cur = get_db_connection()
-    cur.execute("""
+    conn = get_db()
+    cur = conn.execute("""
         SELECT
             c.candidate_id,
             c.election_id,
@@ -52,12 +68,11 @@ def get_candidate_by_candidate_id(candidate_id):
         WHERE c.candidate_id = ?
     """, (candidate_id,))
     candidate = cur.fetchone()
-    conn.close()
     return dict(candidate) if candidate else None
 
 def get_single_candidate(election_id , reg_no):
-    conn, cur = get_db_connection()
-    cur.execute("""
+    conn = get_db()
+    cur = conn.execute("""
         SELECT
             c.candidate_id,
             c.election_id,
@@ -70,19 +85,22 @@ def get_single_candidate(election_id , reg_no):
         WHERE c.election_id = ? AND c.reg_no = ?
     """, (election_id , reg_no))
     candidate = cur.fetchone()
-    conn.close()
     return dict(candidate) if candidate else None
 
 def increment_vote(candidate_id):
-    conn, cur = get_db_connection()
-    cur.execute("UPDATE Candidates SET total_votes=total_votes+1 WHERE candidate_id=?", (candidate_id,))
+    conn = get_db()
+    conn.execute("UPDATE Candidates SET total_votes=total_votes+1 WHERE candidate_id=?", (candidate_id,))
+    # Keep the ballot log in step so recounts don't flag this vote
+    conn.execute("INSERT INTO Ballots (election_id, candidate_id) SELECT election_id, candidate_id FROM Candidates WHERE candidate_id=?", (candidate_id,))
     conn.commit()
     return True
 
 def delete_candidate(candidate_id):
-    conn, cur = get_db_connection()
-    cur.execute("DELETE FROM Candidates WHERE candidate_id = ?", (candidate_id,))
+    conn = get_db()
+    conn.execute("DELETE FROM Candidates WHERE candidate_id = ?", (candidate_id,))
     conn.commit()
-    conn.close()
+    tally_cache.invalidate()
     return True
 
+
+instrument_module(__name__)
@@ -1,37 +1,25 @@
-from ..utils.db import get_db_connection
+from ..utils.db import get_db, fetch_dicts
+from ..utils.metrics import instrument_module
 
-def create_clubs_table():
-    conn, cur = get_db_connection()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS Clubs(
-            club_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            club_name VARCHAR(50) NOT NULL,
-            description TEXT,
-            created_at TEXT,
-            member_count INTEGER DEFAULT 0
-        )
-    """)
-    conn.commit()
-    conn.close()
+PAGE_KEY = ("club_id",)
 
-def get_all_clubs():
+def get_all_clubs(limit=None, after=None, stream=False):
     try:
-        conn, cur = get_db_connection()
-        cur.execute("SELECT * FROM Clubs")
-        clubs = [dict(row) for row in cur.fetchall()]
-        conn.close()
-        return clubs
+        conn = get_db()
+        # LIMIT -1 is SQLite for "no limit"
+        cur = conn.execute("SELECT * FROM Clubs WHERE club_id > ? ORDER BY club_id LIMIT ?",
+                           (after[0] if after else -1, -1 if limit is None else limit))
+        return fetch_dicts(cur, stream)
     except Exception as e:
         print(f"Error fetching clubs: {e}")
         # Return empty list if table doesn't exist or other error
         return []
-    
+
 def get_single_club(club_id):
     try:
-        conn, cur = get_db_connection()
-        cur.execute("SELECT * FROM Clubs where club_id=?",(club_id,))
+        conn = get_db()
+        cur = conn.execute("SELECT * FROM Clubs where club_id=?",(club_id,))
         club = cur.fetchone()
-        conn.close()
         if club:
             return dict(club)
         else:
@@ -39,3 +27,6 @@ def get_single_club(club_id):
     except Exception as e:
         print(f"Error fetching club {club_id}: {e}")
         return None
+
+
+instrument_module(__name__)
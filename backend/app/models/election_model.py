@@ -1,25 +1,63 @@
-from ..utils.db import get_db_connection
+from ..utils.db import get_db, fetch_dicts
+from ..utils.metrics import instrument_module
+import time
+
+# Status is derived from the indexed epoch columns at query time, so it is
+# exact to the second. Elections.status is only a cache kept by the scheduler.
+STATUS_SQL = """
+            CASE
+                WHEN e.start_epoch > :now THEN 'upcoming'
+                WHEN e.end_epoch > :now THEN 'ongoing'
+                ELSE 'completed'
+            END"""
+
+STATUS_FILTERS = {
+    "upcoming": "e.start_epoch > :now",
+    "ongoing": "e.start_epoch <= :now AND e.end_epoch > :now",
+    "completed": "e.end_epoch <= :now",
+}
+# Ongoing elections are the few whose end_epoch is still ahead. Left alone,
+# the planner walks idx_elections_start_epoch to skip the ORDER BY sort and
+# reads every past election on the way; seeking on end_epoch and sorting
+# the open ones is cheaper.
+STATUS_INDEXES = {
+    "ongoing": "INDEXED BY idx_elections_end_epoch",
+}
+
+# Listings are ordered newest first by (start_epoch, election_id); a page
+# cursor carries the last row's start_time and election_id
+PAGE_KEY = ("start_time", "election_id")
+
+def _page_sql(params, after, limit):
+    """Keyset continuation and LIMIT for listings in PAGE_KEY order. Returns (where_sql, limit_sql)."""
+    where_sql = limit_sql = ""
+    if after is not None:
+        where_sql = "AND (e.start_epoch, e.election_id) < (CAST(strftime('%s', :after_start) AS INTEGER), :after_id)"
+        params["after_start"], params["after_id"] = after
+    if limit is not None:
+        limit_sql = "LIMIT :limit"
+        params["limit"] = limit
+    return where_sql, limit_sql
 
 def create_election (club_id , position_id , reg_no , start_time, end_time):
-    conn, cur = get_db_connection()
+    conn = get_db()
     try:
-        cur.execute("""
+        conn.execute("""
             INSERT INTO Elections (club_id , position_id , created_by , start_time, end_time)
             VALUES (?, ?, ?, ?, ?)
         """, (club_id , position_id , reg_no , start_time, end_time))
         conn.commit()
         return True
     except Exception as e:
+        conn.rollback()
         print("Error creating election:", e)
         return False
-    finally:
-        conn.close()
-
-from ..utils.db import get_db_connection
 
-def get_all_elections():
-    conn, cur = get_db_connection()
-    cur.execute("""
+def get_all_elections(limit=None, after=None, stream=False):
+    conn = get_db()
+    params = {"now": int(time.time())}
+    page_where, page_limit = _page_sql(params, after, limit)
+    cur = conn.execute(f"""
         SELECT
             e.election_id,
             c.club_id,
@@ -30,24 +68,26 @@ def get_all_elections():
             u.name AS created_by_name,
             e.start_time,
             e.end_time,
-            e.status,
+            {STATUS_SQL} AS status,
             e.result_declared,
             e.created_at
         FROM Elections e
         JOIN Clubs c ON e.club_id = c.club_id
         JOIN Positions p ON e.position_id = p.position_id
         JOIN Users u ON e.created_by = u.reg_no
-        ORDER BY e.start_time DESC
-    """)
-    elections = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return elections
-
-def get_elections_by_status(status):
-    if status not in ("upcoming", "ongoing", "completed"):
+        WHERE 1 {page_where}
+        ORDER BY e.start_epoch DESC, e.election_id DESC
+        {page_limit}
+    """, params)
+    return fetch_dicts(cur, stream)
+
+def get_elections_by_status(status, limit=None, after=None, stream=False):
+    if status not in STATUS_FILTERS:
         return []
-    conn, cur = get_db_connection()
-    cur.execute("""
+    conn = get_db()
+    params = {"now": int(time.time())}
+    page_where, page_limit = _page_sql(params, after, limit)
+    cur = conn.execute(f"""
         SELECT
             e.election_id,
             c.club_id,
@@ -58,23 +98,22 @@ def get_elections_by_status(status):
             u.name AS created_by_name,
             e.start_time,
             e.end_time,
-            e.status,
+            {STATUS_SQL} AS status,
             e.result_declared,
             e.created_at
-        FROM Elections e
+        FROM Elections e {STATUS_INDEXES.get(status, "")}
         JOIN Clubs c ON e.club_id = c.club_id
         JOIN Positions p ON e.position_id = p.position_id
         JOIN Users u ON e.created_by = u.reg_no
-        WHERE e.status = ?
-        ORDER BY e.start_time DESC
-    """, (status,))
-    elections = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return elections
+        WHERE {STATUS_FILTERS[status]} {page_where}
+        ORDER BY e.start_epoch DESC, e.election_id DESC
+        {page_limit}
+    """, params)
+    return fetch_dicts(cur, stream)
 
 def get_election_by_id(election_id):
-    conn, cur = get_db_connection()
-    cur.execute("""
+    conn = get_db()
+    cur = conn.execute(f"""
         SELECT
             e.election_id,
             c.club_id,
@@ -85,57 +124,121 @@ def get_election_by_id(election_id):
             u.name AS created_by_name,
             e.start_time,
             e.end_time,
-            e.status,
+            {STATUS_SQL} AS status,
             e.result_declared,
             e.created_at
         FROM Elections e
         JOIN Clubs c ON e.club_id = c.club_id
         JOIN Positions p ON e.position_id = p.position_id
         JOIN Users u ON e.created_by = u.reg_no
-        WHERE e.election_id = ?
-    """, (election_id,))
+        WHERE e.election_id = :election_id
+    """, {"now": int(time.time()), "election_id": election_id})
     election = cur.fetchone()
-    conn.close()
     return dict(election) if election else None
 
 def delete_election(election_id):
-    conn, cur = get_db_connection()
-    cur.execute("DELETE FROM Elections WHERE election_id = ?", (election_id,))
+    conn = get_db()
+    conn.execute("DELETE FROM Elections WHERE election_id = ?", (election_id,))
     conn.commit()
-    conn.close()
     return True
 
-def get_elections_by_club(club_id):
-    conn, cur = get_db_connection()
-    cur.execute("""
-        SELECT e.*, p.position_name, u.name as created_by_name
+def get_elections_by_club(club_id, limit=None, after=None, stream=False):
+    conn = get_db()
+    params = {"now": int(time.time()), "club_id": club_id}
+    page_where, page_limit = _page_sql(params, after, limit)
+    cur = conn.execute(f"""
+        SELECT
+            e.election_id,
+            e.club_id,
+            e.position_id,
+            e.start_time,
+            e.end_time,
+            {STATUS_SQL} AS status,
+            e.result_declared,
+            e.created_by,
+            e.created_at,
+            p.position_name,
+            u.name as created_by_name
         FROM Elections e
         JOIN Positions p ON e.position_id = p.position_id
         JOIN Users u ON e.created_by = u.reg_no
-        WHERE e.club_id = ?
-        ORDER BY e.start_time DESC
-    """, (club_id,))
-    elections = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return elections
+        WHERE e.club_id = :club_id {page_where}
+        ORDER BY e.start_epoch DESC, e.election_id DESC
+        {page_limit}
+    """, params)
+    return fetch_dicts(cur, stream)
 
 def update_election_status(election_id, status):
-    if status not in ("upcoming", "ongoing", "completed"):
+    """
+    Manually moves an election to status. Since status is derived from the
+    schedule, this rewrites start/end time: "ongoing" opens it now and
+    "completed" closes it now. Returns False for transitions the schedule
+    can't express (reopening an ended election, or back to "upcoming").
+    """
+    if status not in STATUS_FILTERS:
         return False
-    conn, cur = get_db_connection()
-    cur.execute("""
+    conn = get_db()
+    now = int(time.time())
+    now_iso = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now))
+    if status == "ongoing":
+        cur = conn.execute("""
+            UPDATE Elections
+            SET start_time = CASE WHEN start_epoch > :now THEN :now_iso ELSE start_time END,
+                status = 'ongoing', result_declared = 0
+            WHERE election_id = :election_id AND end_epoch > :now
+        """, {"now": now, "now_iso": now_iso, "election_id": election_id})
+    elif status == "completed":
+        cur = conn.execute("""
+            UPDATE Elections
+            SET start_time = CASE WHEN start_epoch > :now THEN :now_iso ELSE start_time END,
+                end_time = CASE WHEN end_epoch > :now THEN :now_iso ELSE end_time END,
+                status = 'completed'
+            WHERE election_id = :election_id
+        """, {"now": now, "now_iso": now_iso, "election_id": election_id})
+    else:
+        cur = conn.execute("""
+            UPDATE Elections
+            SET status = 'upcoming'
+            WHERE election_id = :election_id AND start_epoch > :now
+        """, {"now": now, "election_id": election_id})
+    conn.commit()
+    return cur.rowcount > 0
+
+def sync_election_statuses(now=None):
+    """
+    Brings the cached Elections.status column in line with the schedule
+    using the epoch indexes. Returns [(election_id, new_status)] for every
+    row that changed.
+    """
+    now = int(time.time()) if now is None else now
+    conn = get_db()
+    started = conn.execute("""
         UPDATE Elections
-        SET status = ?
-        WHERE election_id = ?
-    """, (status, election_id))
+        SET status = 'ongoing', result_declared = 0
+        WHERE status IN ('upcoming', 'completed') AND end_epoch > :now AND start_epoch <= :now
+        RETURNING election_id
+    """, {"now": now}).fetchall()
+    ended = conn.execute("""
+        UPDATE Elections
+        SET status = 'completed'
+        WHERE status IN ('upcoming', 'ongoing') AND end_epoch <= :now
+        RETURNING election_id
+    """, {"now": now}).fetchall()
     conn.commit()
-    conn.close()
-    return True
+    return [(row[0], "ongoing") for row in started] + [(row[0], "completed") for row in ended]
+
 
+def get_election_window(election_id):
+    """(start_epoch, end_epoch) of an election, or None. A primary-key lookup, no joins."""
+    conn = get_db()
+    row = conn.execute("SELECT start_epoch, end_epoch FROM Elections WHERE election_id = ?", (election_id,)).fetchone()
+    return (row["start_epoch"], row["end_epoch"]) if row else None
 
 def get_club_id_of_election(election_id):
-    conn, cur = get_db_connection()
-    cur.execute("SELECT club_id FROM Elections WHERE election_id = ?", (election_id,))
+    conn = get_db()
+    cur = conn.execute("SELECT club_id FROM Elections WHERE election_id = ?", (election_id,))
     row = cur.fetchone()
-    conn.close()
-    return row["club_id"] if row else None
\ No newline at end of file
+    return row["club_id"] if row else None
+
+
+instrument_module(__name__)
@@ -0,0 +1,30 @@
+from ..utils.db import get_db
+from ..utils.metrics import instrument_module
+
+def try_acquire_lease(name, holder, now, ttl_seconds):
+    """
+    Takes or renews the named lease for holder. Succeeds if nobody holds it,
+    holder already holds it, or the current holder's lease has expired.
+    """
+    conn = get_db()
+    try:
+        cur = conn.execute("""
+            INSERT INTO Leases (name, holder, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE
+                SET holder = excluded.holder, expires_at = excluded.expires_at
+                WHERE Leases.holder = excluded.holder OR Leases.expires_at < ?
+        """, (name, holder, now + ttl_seconds, now))
+        conn.commit()
+        return cur.rowcount > 0
+    except Exception as e:
+        conn.rollback()
+        print(f"Error acquiring lease {name}:", e)
+        return False
+
+def release_lease(name, holder):
+    conn = get_db()
+    conn.execute("UPDATE Leases SET expires_at = 0 WHERE name = ? AND holder = ?", (name, holder))
+    conn.commit()
+
+
+instrument_module(__name__)
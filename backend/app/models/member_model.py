@@ -1,122 +1,205 @@
 
-from ..utils.db import get_db_connection
-
-def create_memberships_table():
-    conn, cur = get_db_connection()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS ClubMemberships(
-            membership_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            reg_no CHAR(10) NOT NULL,
-            club_id INTEGER NOT NULL,
-            role VARCHAR(20) DEFAULT 'Member',
-            status VARCHAR(20) DEFAULT 'pending',
-            joined_at TEXT,
-            FOREIGN KEY (reg_no) REFERENCES Users(reg_no),
-            FOREIGN KEY (club_id) REFERENCES Clubs(club_id)
-        )
-    """)
-    conn.commit()
-    conn.close()
-    
+from ..utils.db import get_db, fetch_dicts, immediate_transaction
+from ..utils.metrics import instrument_module
+from ..utils import role_cache
+
+# Page keys for the listings below (see utils/pagination.py). Each matches
+# the listing's ORDER BY, which an index already delivers without sorting.
+USER_CLUBS_PAGE_KEY = ("club_id",)
+MEMBERS_PAGE_KEY = ("membership_id",)
+PENDING_PAGE_KEY = ("join_date", "membership_id")
+
+MEMBERSHIP_STATUSES = ("pending", "approved", "rejected")
+
+def _limit(limit):
+    # LIMIT -1 is SQLite for "no limit"
+    return -1 if limit is None else limit
+
 def add_membership(reg_no, club_id, role="Member"):
-    conn, cur = get_db_connection()
+    conn = get_db()
     try:
-        cur.execute("""
+        conn.execute("""
             INSERT INTO ClubMemberships (reg_no, club_id, role)
             VALUES (?, ?, ?)
         """, (reg_no, club_id, role))
         conn.commit()
         return True
     except Exception as e:
+        conn.rollback()
         print("Error adding membership:", e)
         return False
-    finally:
-        conn.close()
-
-def get_joined_clubs_of_users(reg_no):
-    conn, cur = get_db_connection()
-    cur.execute("SELECT * FROM ClubMemberships WHERE reg_no = ? and status=?", (reg_no, 'approved'))
-    joined_clubs = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return joined_clubs
-
-def get_all_clubs_of_users(reg_no):
-    conn, cur = get_db_connection()
-    cur.execute("SELECT * FROM ClubMemberships WHERE reg_no = ?", (reg_no,))
-    all_joined_clubs = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return all_joined_clubs
-
-def get_approved_members_of_club(club_id):
-    conn, cur = get_db_connection()
-    cur.execute("SELECT * FROM ClubMemberships WHERE club_id = ? and status=?", (club_id, 'approved'))
-    approved_members = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return approved_members
+
+def get_joined_clubs_of_users(reg_no, limit=None, after=None, stream=False):
+    conn = get_db()
+    cur = conn.execute(
+        "SELECT * FROM ClubMemberships WHERE reg_no = ? and status=? and club_id > ? ORDER BY club_id LIMIT ?",
+        (reg_no, 'approved', after[0] if after else -1, _limit(limit)),
+    )
+    return fetch_dicts(cur, stream)
+
+def get_all_clubs_of_users(reg_no, limit=None, after=None, stream=False):
+    conn = get_db()
+    cur = conn.execute(
+        "SELECT * FROM ClubMemberships WHERE reg_no = ? and club_id > ? ORDER BY club_id LIMIT ?",
+        (reg_no, after[0] if after else -1, _limit(limit)),
+    )
+    return fetch_dicts(cur, stream)
+
+def get_approved_members_of_club(club_id, limit=None, after=None, stream=False):
+    conn = get_db()
+    cur = conn.execute(
+        "SELECT * FROM ClubMemberships WHERE club_id = ? and status=? and membership_id > ? ORDER BY membership_id LIMIT ?",
+        (club_id, 'approved', after[0] if after else -1, _limit(limit)),
+    )
+    return fetch_dicts(cur, stream)
+
+def count_approved_members(club_id):
+    """Size of get_approved_members_of_club(club_id), counted on the index."""
+    conn = get_db()
+    cur = conn.execute("SELECT COUNT(*) FROM ClubMemberships WHERE club_id = ? AND status = 'approved'", (club_id,))
+    return cur.fetchone()[0]
 
 def update_membership_status(reg_no , club_id  ,status):
-    if status not in ("pending", "approved", "rejected"):
+    if status not in MEMBERSHIP_STATUSES:
         return False
-    conn, cur = get_db_connection()
-    cur.execute("UPDATE ClubMemberships SET status = ? WHERE reg_no = ? AND club_id = ?", (status, reg_no, club_id))
+    conn = get_db()
+    conn.execute("UPDATE ClubMemberships SET status = ? WHERE reg_no = ? AND club_id = ?", (status, reg_no, club_id))
     conn.commit()
-    conn.close()
+    role_cache.invalidate(reg_no, club_id)
     return True
 
+# Pairs per lookup statement; two parameters each stays far below SQLite's variable limit
+_LOOKUP_CHUNK = 400
+
+def update_membership_statuses(items):
+    """
+    Applies many (reg_no, club_id, status) changes in one transaction.
+    Returns one result per item, in order: "updated", "not_found" or
+    "invalid_status".
+    """
+    results = [None] * len(items)
+    valid = []
+    for i, (reg_no, club_id, status) in enumerate(items):
+        if status in MEMBERSHIP_STATUSES:
+            valid.append((i, reg_no, int(club_id), status))
+        else:
+            results[i] = "invalid_status"
+
+    try:
+        with immediate_transaction() as conn:
+            # One set-based lookup per chunk tells us which pairs exist
+            existing = set()
+            for start in range(0, len(valid), _LOOKUP_CHUNK):
+                chunk = valid[start:start + _LOOKUP_CHUNK]
+                pairs = ", ".join(["(?, ?)"] * len(chunk))
+                params = [value for _, reg_no, club_id, _ in chunk for value in (reg_no, club_id)]
+                existing.update(tuple(row) for row in conn.execute(f"""
+                    WITH requested(reg_no, club_id) AS (VALUES {pairs})
+                    SELECT m.reg_no, m.club_id
+                    FROM requested r
+                    JOIN ClubMemberships m ON m.reg_no = r.reg_no AND m.club_id = r.club_id
+                """, params))
+            updates = []
+            for i, reg_no, club_id, status in valid:
+                if (reg_no, club_id) in existing:
+                    updates.append((status, reg_no, club_id))
+                    results[i] = "updated"
+                else:
+                    results[i] = "not_found"
+            conn.executemany("UPDATE ClubMemberships SET status = ? WHERE reg_no = ? AND club_id = ?", updates)
+    except Exception as e:
+        print("Error updating membership statuses:", e)
+        return None
+
+    for _, reg_no, club_id in updates:
+        role_cache.invalidate(reg_no, club_id)
+    return results
+
+def resolve_pending_memberships(club_id, status):
+    """Sets every pending request of a club to status in one statement. Returns the affected reg_nos."""
+    if status not in ("approved", "rejected"):
+        return None
+    conn = get_db()
+    try:
+        cur = conn.execute(
+            "UPDATE ClubMemberships SET status = ? WHERE club_id = ? AND status = 'pending' RETURNING reg_no",
+            (status, club_id),
+        )
+        reg_nos = [row[0] for row in cur.fetchall()]
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print("Error resolving pending memberships:", e)
+        return None
+
+    for reg_no in reg_nos:
+        role_cache.invalidate(reg_no, club_id)
+    return reg_nos
+
 def update_member_role(membership_id, role):
     print(role)
     if role not in ["Member", "Head"]:
         return False
-    conn, cur = get_db_connection()
+    conn = get_db()
     try:
-        cur.execute(
-            "UPDATE ClubMemberships SET role=? WHERE membership_id=? AND status=?",
+        cur = conn.execute(
+            "UPDATE ClubMemberships SET role=? WHERE membership_id=? AND status=? RETURNING reg_no, club_id",
             (role, membership_id, "approved"),
         )
+        updated = cur.fetchall()
         conn.commit()
-        rows_affected = cur.rowcount
     except Exception as e:
+        conn.rollback()
         print("DB Error:", e)
-        rows_affected = 0
-    finally:
-        conn.close()
+        updated = []
 
-    return rows_affected > 0 
+    for reg_no, club_id in updated:
+        role_cache.invalidate(reg_no, club_id)
+    return len(updated) > 0
 def get_member_role(reg_no ,  club_id):
-    conn, cur = get_db_connection()
-    cur.execute("SELECT role FROM ClubMemberships WHERE reg_no = ? and club_id = ? and status=?", (reg_no, club_id, 'approved'))
+    return role_cache.get_member_role(reg_no, club_id, lambda: _load_member_role(reg_no, club_id))
+
+def _load_member_role(reg_no, club_id):
+    conn = get_db()
+    cur = conn.execute("SELECT role FROM ClubMemberships WHERE reg_no = ? and club_id = ? and status=?", (reg_no, club_id, 'approved'))
     role = cur.fetchone()
-    conn.close()
     return role[0] if role else None
 
-def get_clubs_headed_by_user(reg_no):
+def get_clubs_headed_by_user(reg_no, limit=None, after=None, stream=False):
     """
     Returns all clubs where the user is the head.
     """
-    conn, cur = get_db_connection()
-    cur.execute("""
+    conn = get_db()
+    cur = conn.execute("""
         SELECT c.*, cm.role, cm.status
         FROM Clubs c
         JOIN ClubMemberships cm ON c.club_id = cm.club_id
-        WHERE cm.reg_no = ? AND cm.role = 'Head' AND cm.status = 'approved'
-    """, (reg_no,))
-    headed_clubs = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return headed_clubs
+        WHERE cm.reg_no = ? AND cm.role = 'Head' AND cm.status = 'approved' AND cm.club_id > ?
+        ORDER BY cm.club_id
+        LIMIT ?
+    """, (reg_no, after[0] if after else -1, _limit(limit)))
+    return fetch_dicts(cur, stream)
 
-def get_pending_requests():
+def get_pending_requests(limit=None, after=None, stream=False):
     """
     Returns all pending club membership requests with user and club info.
     """
-    conn, cur = get_db_connection()
-    cur.execute('''
+    conn = get_db()
+    page_where = ""
+    params = {"limit": _limit(limit)}
+    if after is not None:
+        page_where = "AND (cm.join_date, cm.membership_id) < (:after_join_date, :after_id)"
+        params["after_join_date"], params["after_id"] = after
+    cur = conn.execute(f'''
         SELECT cm.membership_id, cm.reg_no, cm.club_id, cm.join_date, u.name as user_name, c.name as club_name
         FROM ClubMemberships cm
         JOIN Users u ON cm.reg_no = u.reg_no
         JOIN Clubs c ON cm.club_id = c.club_id
-        WHERE cm.status = 'pending'
-        ORDER BY cm.join_date DESC
-    ''')
-    pending = [dict(row) for row in cur.fetchall()]
-    conn.close()
-    return pending
\ No newline at end of file
+        WHERE cm.status = 'pending' {page_where}
+        ORDER BY cm.join_date DESC, cm.membership_id DESC
+        LIMIT :limit
+    ''', params)
+    return fetch_dicts(cur, stream)
+
+
+instrument_module(__name__)
@@ -1,27 +1,27 @@
-from ..utils.db import get_db_connection
+from ..utils.db import get_db, fetch_dicts
+from ..utils.metrics import instrument_module
 
 def get_all_positions():
     """Get all available positions"""
-    conn, cur = get_db_connection()
+    conn = get_db()
     try:
-        cur.execute("SELECT position_id, position_name FROM Positions ORDER BY position_name")
-        positions = [dict(row) for row in cur.fetchall()]
+        cur = conn.execute("SELECT position_id, position_name FROM Positions ORDER BY position_name")
+        positions = fetch_dicts(cur)
         return positions
     except Exception as e:
         print("Error fetching positions:", e)
         return []
-    finally:
-        conn.close()
 
 def get_position_by_id(position_id):
     """Get a specific position by ID"""
-    conn, cur = get_db_connection()
+    conn = get_db()
     try:
-        cur.execute("SELECT position_id, position_name FROM Positions WHERE position_id = ?", (position_id,))
+        cur = conn.execute("SELECT position_id, position_name FROM Positions WHERE position_id = ?", (position_id,))
         position = cur.fetchone()
         return dict(position) if position else None
     except Exception as e:
         print("Error fetching position:", e)
         return None
-    finally:
-        conn.close()
\ No newline at end of file
+
+
+instrument_module(__name__)
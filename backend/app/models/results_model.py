@@ -0,0 +1,123 @@
+from ..utils.db import get_db, immediate_transaction
+from ..utils.metrics import instrument_module
+from .candidate_model import query_candidates_by_election
+from .member_model import count_approved_members
+import json
+import os
+import time
+
+# Elections declared per scheduler tick while catching up on a backlog
+RESULTS_DECLARE_BATCH = int(os.environ.get("RESULTS_DECLARE_BATCH", 200))
+
+
+def _rank(candidates, votes_cast):
+    """
+    Adds rank (1, 2, 2, 4 style), vote_share and tied to candidates, which
+    must already be sorted by total_votes descending.
+    """
+    counts = {}
+    for c in candidates:
+        counts[c["total_votes"]] = counts.get(c["total_votes"], 0) + 1
+    ranked = []
+    for position, c in enumerate(candidates, start=1):
+        if ranked and ranked[-1]["total_votes"] == c["total_votes"]:
+            rank = ranked[-1]["rank"]
+        else:
+            rank = position
+        ranked.append({
+            **c,
+            "rank": rank,
+            "vote_share": round(c["total_votes"] / votes_cast, 4) if votes_cast else 0.0,
+            "tied": counts[c["total_votes"]] > 1,
+        })
+    return ranked
+
+
+def compute_results(election_id):
+    """
+    Ranked results of an election as they stand, or None if it doesn't
+    exist. Turnout is measured against the club's approved members.
+    """
+    conn = get_db()
+    election = conn.execute(
+        "SELECT club_id, end_epoch FROM Elections WHERE election_id = ?", (election_id,)
+    ).fetchone()
+    if not election:
+        return None
+    eligible = count_approved_members(election["club_id"])
+    candidates = query_candidates_by_election(election_id)
+    votes_cast = sum(c["total_votes"] for c in candidates)
+    ranked = _rank(candidates, votes_cast)
+    return {
+        "election_id": election_id,
+        "end_epoch": election["end_epoch"],
+        "eligible_voters": eligible,
+        "votes_cast": votes_cast,
+        "turnout": round(votes_cast / eligible, 4) if eligible else 0.0,
+        "tied_for_first": sum(1 for c in ranked if c["rank"] == 1) > 1,
+        "candidates": ranked,
+    }
+
+
+def declare_results(election_id, now=None):
+    """
+    Computes and stores the final results of an election whose voting
+    window has closed, and sets Elections.result_declared. Ballots are
+    refused once end_epoch has passed, so the snapshot never goes stale
+    unless the election is rescheduled. Returns the snapshot, or None if
+    the election doesn't exist or is still open.
+    """
+    now = int(time.time()) if now is None else now
+    try:
+        with immediate_transaction() as conn:
+            results = compute_results(election_id)
+            if results is None or results["end_epoch"] > now:
+                return None
+            results["declared_at"] = now
+            # A rescheduled election replaces its old snapshot; rows are never updated in place
+            conn.execute("""
+                INSERT OR REPLACE INTO ElectionResults
+                    (election_id, end_epoch, declared_at, eligible_voters, votes_cast, turnout, tied_for_first, candidates)
+                VALUES
+                    (:election_id, :end_epoch, :declared_at, :eligible_voters, :votes_cast, :turnout, :tied_for_first, :candidates)
+            """, {**results, "candidates": json.dumps(results["candidates"], separators=(",", ":"))})
+            conn.execute("UPDATE Elections SET result_declared = 1 WHERE election_id = ?", (election_id,))
+        return results
+    except Exception as e:
+        print(f"Error declaring results for election {election_id}:", e)
+        return None
+
+
+def declare_pending_results(now=None, limit=RESULTS_DECLARE_BATCH):
+    """Declares results for up to limit completed elections that don't have them yet. Returns their ids."""
+    conn = get_db()
+    pending = [row[0] for row in conn.execute("""
+        SELECT election_id FROM Elections
+        WHERE status = 'completed' AND result_declared = 0
+        ORDER BY end_epoch
+        LIMIT ?
+    """, (limit,))]
+    return [election_id for election_id in pending if declare_results(election_id, now) is not None]
+
+
+def get_results_snapshot(election_id):
+    """
+    The stored final results of an election, or None if none are declared
+    or the election has been rescheduled since. A primary-key lookup.
+    """
+    conn = get_db()
+    row = conn.execute("""
+        SELECT r.*
+        FROM ElectionResults r
+        JOIN Elections e ON e.election_id = r.election_id AND e.end_epoch = r.end_epoch
+        WHERE r.election_id = ?
+    """, (election_id,)).fetchone()
+    if not row:
+        return None
+    results = dict(row)
+    results["tied_for_first"] = bool(results["tied_for_first"])
+    results["candidates"] = json.loads(results["candidates"])
+    return results
+
+
+instrument_module(__name__)
@@ -0,0 +1,41 @@
+from ..utils.db import get_db
+from ..utils.metrics import instrument_module
+
+def get_vote_buckets(election_id, bucket_s, start, end):
+    """
+    [(bucket_start, votes)] for an election at one rollup resolution (60 or
+    3600 seconds), oldest first, for buckets starting in [start, end).
+    """
+    conn = get_db()
+    cur = conn.execute("""
+        SELECT bucket_start, votes
+        FROM VoteRollups
+        WHERE election_id = ? AND bucket_s = ? AND bucket_start >= ? AND bucket_start < ?
+        ORDER BY bucket_start
+    """, (election_id, bucket_s, start, end))
+    return cur.fetchall()
+
+
+def get_club_election_votes(club_id):
+    """Every election of a club, oldest first, with the votes cast in it (from the hourly rollups)."""
+    conn = get_db()
+    cur = conn.execute("""
+        SELECT
+            e.election_id,
+            e.position_id,
+            p.position_name,
+            e.start_time,
+            e.end_time,
+            e.start_epoch,
+            e.end_epoch,
+            (SELECT COALESCE(SUM(r.votes), 0) FROM VoteRollups r
+             WHERE r.election_id = e.election_id AND r.bucket_s = 3600) AS votes_cast
+        FROM Elections e
+        JOIN Positions p ON p.position_id = e.position_id
+        WHERE e.club_id = ?
+        ORDER BY e.start_epoch
+    """, (club_id,))
+    return [dict(row) for row in cur]
+
+
+instrument_module(__name__)
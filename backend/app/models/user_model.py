@@ -1,44 +1,58 @@
-from ..utils.db import get_db_connection
-from werkzeug.security import generate_password_hash, check_password_hash
+from ..utils.db import get_db, immediate_transaction
+from ..utils.metrics import instrument_module
+from ..utils.password_pool import hash_password, check_password
+from ..utils import role_cache
 from datetime import datetime
 
-def create_user_table():
-    conn, cur = get_db_connection()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS Users(
-            reg_no CHAR(10) PRIMARY KEY,
-            password TEXT NOT NULL,
-            name VARCHAR(25) NOT NULL,
-            created_at TEXT
-        )
-    """)
-    conn.commit()
-    conn.close()
-
 def add_user(reg_no, password, name):
-    conn, cur = get_db_connection()
-    hashed_pw = generate_password_hash(password)
+    hashed_pw = hash_password(password)
+    conn = get_db()
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    cur.execute("INSERT INTO Users (reg_no, password, name, created_at) VALUES (?, ?, ?, ?)",
+    conn.execute("INSERT INTO Users (reg_no, password, name, created_at) VALUES (?, ?, ?, ?)",
                 (reg_no, hashed_pw, name, now))
     conn.commit()
-    conn.close()
+
+def find_existing_reg_nos(reg_nos):
+    """The subset of reg_nos that already have a Users row, in one query."""
+    if not reg_nos:
+        return set()
+    placeholders = ", ".join("?" * len(reg_nos))
+    conn = get_db()
+    cur = conn.execute(f"SELECT reg_no FROM Users WHERE reg_no IN ({placeholders})", tuple(reg_nos))
+    return {row[0] for row in cur}
+
+def add_users(users):
+    """
+    Inserts (reg_no, password_hash, name) rows in one transaction. Rows whose
+    reg_no was registered in the meantime are ignored. Returns the number
+    inserted.
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with immediate_transaction() as conn:
+        cur = conn.executemany(
+            "INSERT OR IGNORE INTO Users (reg_no, password, name, created_at) VALUES (?, ?, ?, ?)",
+            [(reg_no, password_hash, name, now) for reg_no, password_hash, name in users],
+        )
+        return cur.rowcount
 
 def get_user_by_reg_no(reg_no):
-    conn, cur = get_db_connection()
-    cur.execute("SELECT * FROM Users WHERE reg_no=?", (reg_no,))
-    user = cur.fetchone()
-    conn.close()
-    return user
+    conn = get_db()
+    cur = conn.execute("SELECT * FROM Users WHERE reg_no=?", (reg_no,))
+    return cur.fetchone()
 
 def verify_password(user, password):
-    return check_password_hash(user[1], password)
+    return check_password(user[1], password)
 
 def get_user_role(reg_no):
-    conn, cur = get_db_connection()
-    cur.execute("SELECT role FROM Users WHERE reg_no=?", (reg_no,))
+    return role_cache.get_site_role(reg_no, lambda: _load_user_role(reg_no))
+
+def _load_user_role(reg_no):
+    conn = get_db()
+    cur = conn.execute("SELECT role FROM Users WHERE reg_no=?", (reg_no,))
     row = cur.fetchone()
-    conn.close()
     if row and row[0]:
         return row[0]
     return None
+
+
+instrument_module(__name__)
@@ -1,26 +1,151 @@
-from ..utils.db import get_db_connection
+from ..utils.db import get_db, immediate_transaction
+from ..utils.metrics import instrument_module
+from ..utils import tally_cache, voted_cache
+from .candidate_model import get_tally_version
 from datetime import datetime
+import time
 
 def add_vote_record(reg_no, election_id):
-    conn, cur = get_db_connection()
+    conn = get_db()
     try:
-        cur.execute("INSERT INTO Votes (reg_no, election_id) VALUES (?, ?)",
+        conn.execute("INSERT INTO Votes (reg_no, election_id) VALUES (?, ?)",
                     (reg_no,election_id))
         conn.commit()
         return True
     except Exception as e:
+        conn.rollback()
         print("error in recording vote:",e)
         return False
-    finally:
-        conn.close()
 
 '''already vote cheythittundo ennariyan reg_no and election_id vech check cheyyum.
     ith true aanel aa electionu ee userinte button disable aayi irikkanam.
     false aaanel vote button active aayitt irikkanam'''
 def check_vote(reg_no, election_id):
-    conn, cur = get_db_connection()
-    cur.execute("SELECT EXISTS(SELECT 1 FROM Votes WHERE reg_no = ? AND election_id = ?)", (reg_no,election_id))
+    conn = get_db()
+    cur = conn.execute("SELECT EXISTS(SELECT 1 FROM Votes WHERE reg_no = ? AND election_id = ?)", (reg_no,election_id))
     exists=cur.fetchone()[0]
     if exists:
         return True
-    return False
\ No newline at end of file
+    return False
+
+def get_voted_election_ids(reg_no):
+    conn = get_db()
+    cur = conn.execute("SELECT election_id FROM Votes WHERE reg_no = ?", (reg_no,))
+    return [row[0] for row in cur.fetchall()]
+
+def check_votes(reg_no, election_ids):
+    """Returns {election_id: has_voted} for many elections, answered from the voted-set cache."""
+    voted = voted_cache.get_voted_elections(reg_no, get_voted_election_ids)
+    return {election_id: election_id in voted for election_id in election_ids}
+
+def apply_ballot(conn, reg_no, election_id, candidate_id):
+    """
+    Validates and records one ballot on a connection that already holds the
+    write lock. Returns one of: "recorded", "election_not_found",
+    "not_ongoing", "invalid_candidate", "wrong_election", "not_member",
+    "already_voted".
+    """
+    row = conn.execute("""
+        SELECT
+            e.start_epoch <= :now AND e.end_epoch > :now AS is_open,
+            c.election_id AS candidate_election_id,
+            m.role
+        FROM Elections e
+        LEFT JOIN Candidates c ON c.candidate_id = :candidate_id
+        LEFT JOIN ClubMemberships m
+            ON m.reg_no = :reg_no AND m.club_id = e.club_id AND m.status = 'approved'
+        WHERE e.election_id = :election_id
+    """, {"now": int(time.time()), "candidate_id": candidate_id, "reg_no": reg_no,
+          "election_id": election_id}).fetchone()
+
+    if not row:
+        return "election_not_found"
+    if not row["is_open"]:
+        return "not_ongoing"
+    if row["candidate_election_id"] is None:
+        return "invalid_candidate"
+    if row["candidate_election_id"] != election_id:
+        return "wrong_election"
+    if not row["role"]:
+        return "not_member"
+
+    # UNIQUE(reg_no, election_id) makes this the race-free "already voted" check
+    cur = conn.execute("INSERT OR IGNORE INTO Votes (reg_no, election_id) VALUES (?, ?)",
+                       (reg_no, election_id))
+    if cur.rowcount == 0:
+        return "already_voted"
+    conn.execute("UPDATE Candidates SET total_votes=total_votes+1 WHERE candidate_id=?", (candidate_id,))
+    # The counter above is what results read; the ballot is what a recount checks it against
+    conn.execute("INSERT INTO Ballots (election_id, candidate_id) VALUES (?, ?)", (election_id, candidate_id))
+    return "recorded"
+
+def _apply_and_version(conn, reg_no, election_id, candidate_id):
+    outcome = apply_ballot(conn, reg_no, election_id, candidate_id)
+    version = get_tally_version(election_id) if outcome == "recorded" else None
+    return outcome, version
+
+def _publish(ballot, outcome, version):
+    # Only called after commit, so caches never see a rolled-back vote
+    reg_no, election_id, candidate_id = ballot
+    if outcome == "recorded":
+        tally_cache.record_vote(election_id, int(candidate_id), version)
+    if outcome in ("recorded", "already_voted"):
+        voted_cache.record_vote(reg_no, election_id)
+
+def cast_vote(reg_no, election_id, candidate_id):
+    """Records a single ballot in its own BEGIN IMMEDIATE transaction."""
+    with immediate_transaction() as conn:
+        outcome, version = _apply_and_version(conn, reg_no, election_id, candidate_id)
+    _publish((reg_no, election_id, candidate_id), outcome, version)
+    return outcome
+
+def cast_votes_batch(ballots):
+    """
+    Records many (reg_no, election_id, candidate_id) ballots in one
+    transaction (one commit, one fsync). Returns outcomes in input order.
+    Each ballot runs in its own savepoint: one that raises is rolled back
+    alone and its outcome is the exception, while the rest still commit.
+    """
+    results = []
+    with immediate_transaction() as conn:
+        for ballot in ballots:
+            conn.execute("SAVEPOINT ballot")
+            try:
+                results.append(_apply_and_version(conn, *ballot))
+            except Exception as e:
+                conn.execute("ROLLBACK TO ballot")
+                results.append((e, None))
+            conn.execute("RELEASE ballot")
+    for ballot, (outcome, version) in zip(ballots, results):
+        if not isinstance(outcome, Exception):
+            _publish(ballot, outcome, version)
+    return [outcome for outcome, _ in results]
+
+# --- Recount reads (utils/recount.py). They take a connection because each
+# recount shard runs on its own read-only one, in a worker thread or process.
+
+def get_election_id_range(conn):
+    """(lowest, highest) election_id, or (None, None) if there are no elections."""
+    return tuple(conn.execute(
+        "SELECT (SELECT MIN(election_id) FROM Elections), (SELECT MAX(election_id) FROM Elections)"
+    ).fetchone())
+
+def count_ballots(conn, first_election_id, last_election_id):
+    """[(election_id, candidate_id, ballots)] for elections in the id range, counted on the covering index."""
+    return conn.execute("""
+        SELECT election_id, candidate_id, COUNT(*)
+        FROM Ballots
+        WHERE election_id BETWEEN ? AND ?
+        GROUP BY election_id, candidate_id
+    """, (first_election_id, last_election_id)).fetchall()
+
+def get_recorded_tallies(conn, first_election_id, last_election_id):
+    """[(candidate_id, election_id, total_votes, baseline_votes)] for elections in the id range."""
+    return conn.execute("""
+        SELECT candidate_id, election_id, total_votes, baseline_votes
+        FROM Candidates
+        WHERE election_id BETWEEN ? AND ?
+    """, (first_election_id, last_election_id)).fetchall()
+
+
+instrument_module(__name__)
@@ -1,5 +1,11 @@
+import csv
+import io
+import shutil
+import tempfile
 from flask import Blueprint, request, jsonify, session
-from ..services.auth_service import register_user, authenticate_user
+from ..services.auth_service import register_user, authenticate_user, public_user, password_pool_stats_service, import_users_service
+from ..utils.json_stream import json_lines_response
+from ..utils.password_pool import PasswordPoolBusy
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -12,10 +18,52 @@ def register():
     password = data["password"]
     name = data["name"]
 
-    success, msg = register_user(reg_no, password, name)
+    try:
+        success, msg = register_user(reg_no, password, name)
+    except PasswordPoolBusy:
+        return jsonify(msg="SERVER BUSY, TRY AGAIN"), 503
     status = 200 if success else 409
     return jsonify(msg=msg), status
 
+@auth_bp.route("/import", methods=["POST", "OPTIONS"])
+def import_users():
+    """
+    Bulk registration from a multipart CSV upload (field "file", rows of
+    reg_no,name,password; a header row is optional) plus "admin". Replies
+    with one JSON progress line per imported chunk as the import runs.
+    """
+    if request.method == "OPTIONS":
+        return "", 200
+    upload = request.files.get("file")
+    if upload is None:
+        return jsonify({"error": "CSV file is required"}), 400
+
+    # The request closes its uploads once the view returns, before the
+    # response is streamed, so the import reads from its own spooled copy
+    source = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    shutil.copyfileobj(upload.stream, source)
+    source.seek(0)
+    rows = csv.reader(io.TextIOWrapper(source, encoding="utf-8-sig", newline=""))
+    report, error = import_users_service(request.form.get("admin"), rows)
+    if error:
+        source.close()
+        return jsonify(error[0]), error[1]
+
+    def progress():
+        totals = {}
+        try:
+            for totals in report:
+                yield totals
+        except PasswordPoolBusy:
+            # Chunks reported so far are committed; the rest can be retried
+            yield {**totals, "error": "SERVER BUSY, TRY AGAIN"}
+        except (UnicodeDecodeError, csv.Error) as e:
+            yield {**totals, "error": f"Unreadable CSV: {e}"}
+        finally:
+            source.close()
+
+    return json_lines_response(progress())
+
 @auth_bp.route("/login", methods=["POST", "OPTIONS"])
 def login():
     if request.method == "OPTIONS":
@@ -25,27 +73,18 @@ def login():
     reg_no = data["reg_no"]
     password = data["password"]
 
-    success, result = authenticate_user(reg_no, password)
+    try:
+        success, result = authenticate_user(reg_no, password)
+    except PasswordPoolBusy:
+        return jsonify(msg="SERVER BUSY, TRY AGAIN"), 503
     
     if not success:
         return jsonify(msg=result), 401
 
     session['reg_no'] = reg_no
-    
-    # Also return user data directly with the login response
-    from ..models.user_model import get_user_by_reg_no, get_user_role
-    user_data = get_user_by_reg_no(reg_no)
-    
-    if user_data:
-        user_role = get_user_role(reg_no) or "user"  # Default to 'user' if no role found
-        user_info = {
-            "reg_no": user_data[0],
-            "name": user_data[2],
-            "role": user_role
-        }
-        return jsonify(msg="logged in", user=user_info), 200
-    else:
-        return jsonify(msg="logged in"), 200
+    # Name and role travel in the signed session cookie so /me needs no DB read
+    session['claims'] = result
+    return jsonify(msg="logged in", user=public_user(result)), 200
 
 @auth_bp.route("/logout", methods=["POST", "OPTIONS"])
 def logout():
@@ -53,3 +92,7 @@ def logout():
         return "", 200
     session.clear()
     return jsonify(msg="Logged out successfully"), 200
+
+@auth_bp.route("/hashing/stats", methods=["GET"])
+def hashing_stats():
+    return jsonify(password_pool_stats_service()), 200
@@ -1,12 +1,19 @@
 
 from flask import Blueprint, jsonify, request
-from ..services.club_service import fetch_clubs, fetch_single_club
+from ..services.club_service import fetch_clubs, fetch_single_club, CLUB_PAGE_KEY
 from ..services.member_service import (
     request_membership,
     get_club_approved_members,
     change_membership_status,
-    upgrade_to_head_service
+    upgrade_to_head_service,
+    bulk_change_membership_status_service,
+    resolve_pending_requests_service,
+    MEMBERS_PAGE_KEY,
+    PENDING_PAGE_KEY,
 )
+from ..services.votes_service import club_turnout_service
+from ..utils.conditional import conditional
+from ..utils.pagination import paginate
 
 club_bp = Blueprint("club", __name__)
 
@@ -15,14 +22,17 @@ club_bp = Blueprint("club", __name__)
 def get_all_clubs():
     if request.method == "OPTIONS":
         return "", 200
-    clubs = fetch_clubs()
-    return jsonify(clubs), 200
+    return conditional(("Clubs",), lambda: paginate(fetch_clubs, CLUB_PAGE_KEY))
 
 
 @club_bp.route("/<int:club_id>", methods=["GET", "OPTIONS"])
 def get_club(club_id):
     if request.method == "OPTIONS":
         return "", 200
+    return conditional(("Clubs",), lambda: _club_body(club_id))
+
+
+def _club_body(club_id):
     club = fetch_single_club(club_id)
     if club:    
         return jsonify(club), 200
@@ -34,8 +44,7 @@ def get_pending_requests_route():
         return "", 200
     # In production, check admin role here. For now, just return all pending requests.
     from ..services.member_service import get_pending_requests_service
-    pending = get_pending_requests_service()
-    return jsonify(pending), 200
+    return paginate(get_pending_requests_service, PENDING_PAGE_KEY)
 @club_bp.route("/<int:club_id>/join", methods=["POST", "OPTIONS"])
 def join_club(club_id):
     if request.method == "OPTIONS":
@@ -62,8 +71,14 @@ def get_club_members(club_id):
     if status != "approved":
         return jsonify(msg="Only 'approved' members are supported currently"), 400
 
-    members = get_club_approved_members(club_id)
-    return jsonify(members), 200
+    return paginate(lambda *page: get_club_approved_members(club_id, *page), MEMBERS_PAGE_KEY)
+
+@club_bp.route("/<int:club_id>/turnout", methods=["GET", "OPTIONS"])
+def get_club_turnout(club_id):
+    if request.method == "OPTIONS":
+        return "", 200
+    result, status = club_turnout_service(club_id)
+    return jsonify(result), status
 
 @club_bp.route("/<int:club_id>/membership/status", methods=["PATCH", "OPTIONS"])
 def update_member_status(club_id):
@@ -85,6 +100,36 @@ def update_member_status(club_id):
     else:
         return jsonify(msg="Failed to update membership status"), 400
     
+# bulk review: {"admin": ..., "items": [{"reg_no", "club_id", "status"}, ...]}
+
+@club_bp.route("/memberships/status", methods=["PATCH", "OPTIONS"])
+def bulk_update_member_status():
+    if request.method == "OPTIONS":
+        return "", 200
+    data = request.get_json() or {}
+    admin_reg_no = data.get("admin")
+
+    if not admin_reg_no:
+        return jsonify(error="Missing admin registration number"), 400
+
+    result, status_code = bulk_change_membership_status_service(admin_reg_no, data.get("items"))
+    return jsonify(result), status_code
+
+# approve or reject every pending request of one club: {"admin": ..., "status": "approved"}
+
+@club_bp.route("/<int:club_id>/membership/pending", methods=["PATCH", "OPTIONS"])
+def resolve_pending_members(club_id):
+    if request.method == "OPTIONS":
+        return "", 200
+    data = request.get_json() or {}
+    admin_reg_no = data.get("admin")
+
+    if not admin_reg_no:
+        return jsonify(error="Missing admin registration number"), 400
+
+    result, status_code = resolve_pending_requests_service(admin_reg_no, club_id, data.get("status"))
+    return jsonify(result), status_code
+
 @club_bp.route("/memberships/<int:membership_id>/upgrade", methods=["PATCH", "OPTIONS"])
 def upgrade_membership_route(membership_id):
     if request.method == "OPTIONS":
@@ -1,4 +1,4 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from ..services.election_service import (
     create_election_service,
     fetch_all_elections,
@@ -7,8 +7,13 @@ from ..services.election_service import (
     get_club_elections,
     delete_election_service,
     update_election_status_service,
+    get_election_phase,
+    ELECTION_PAGE_KEY,
 )
-from ..services.candidate_service import register_candidate_service  , get_election_candidates_service
+from ..utils.conditional import conditional, REFERENCE_MAX_AGE_S
+from ..utils.pagination import paginate
+from ..services.votes_service import election_turnout_service
+from ..services.candidate_service import register_candidate_service  , get_election_candidates_service, get_election_results_service, stream_election_results_service
 
 election_bp = Blueprint("election", __name__)
 
@@ -39,32 +44,49 @@ def create_election_handler():
 # ---------------- READ ---------------- #
 @election_bp.route("/all", methods=["GET"])
 def get_all_elections_handler():
-    elections = fetch_all_elections()
-    return jsonify(elections), 200
+    return paginate(fetch_all_elections, ELECTION_PAGE_KEY)
 
 
 @election_bp.route("/status/<string:status>", methods=["GET"])
 def get_elections_by_status_handler(status):
-    elections = fetch_elections_by_status(status)
-    if not elections:
-        return jsonify({"error": "No elections found or invalid status"}), 404
-    return jsonify(elections), 200
+    return paginate(
+        lambda *page: fetch_elections_by_status(status, *page),
+        ELECTION_PAGE_KEY,
+        empty=({"error": "No elections found or invalid status"}, 404),
+    )
 
 
-@election_bp.route("/<int:election_id>", methods=["GET"])
-def get_election_by_id_handler(election_id):
+def _election_body(election_id):
     result = get_single_election(election_id)
     if isinstance(result, tuple):  # Error case
         return jsonify(result[0]), result[1]
     return jsonify(result), 200
 
 
+@election_bp.route("/<int:election_id>", methods=["GET"])
+def get_election_by_id_handler(election_id):
+    # Status is derived from the clock, so the cached copy is only good until
+    # the next start/end boundary
+    phase = get_election_phase(election_id)
+    if phase is None:
+        return _election_body(election_id)
+    status, changes_in = phase
+    max_age = REFERENCE_MAX_AGE_S if changes_in is None else min(REFERENCE_MAX_AGE_S, changes_in)
+    return conditional(
+        ("Elections", "Clubs", "Positions", "Users"),
+        lambda: _election_body(election_id),
+        extra=(status,),
+        max_age=max_age,
+    )
+
+
 @election_bp.route("/club/<int:club_id>", methods=["GET"])
 def get_club_elections_handler(club_id):
-    elections = get_club_elections(club_id)
-    if not elections:
-        return jsonify({"message": "No elections found for this club"}), 404
-    return jsonify(elections), 200
+    return paginate(
+        lambda *page: get_club_elections(club_id, *page),
+        ELECTION_PAGE_KEY,
+        empty=({"message": "No elections found for this club"}, 404),
+    )
 
 
 # ---------------- UPDATE ---------------- #
@@ -121,3 +143,33 @@ def get_election_candidates(election_id):
     candidates, status = get_election_candidates_service(election_id)
     return jsonify(candidates), status
 
+@election_bp.route("/<int:election_id>/results", methods=["GET"])
+def get_election_results(election_id):
+    results, status = get_election_results_service(election_id)
+    response = jsonify(results)
+    response.status_code = status
+    if status == 200 and results["final"]:
+        # Declared results only change if the election is rescheduled, which moves end_epoch
+        response.set_etag(f"results-{election_id}-{results['end_epoch']}-{results['declared_at']}", weak=True)
+        response.cache_control.public = True
+        response.cache_control.max_age = REFERENCE_MAX_AGE_S
+        response.make_conditional(request)
+    return response
+
+@election_bp.route("/<int:election_id>/turnout", methods=["GET"])
+def get_election_turnout(election_id):
+    bucket = request.args.get("bucket", type=int)
+    if "bucket" in request.args and bucket is None:
+        return jsonify({"error": "bucket must be a number of minutes"}), 400
+    result, status = election_turnout_service(election_id, bucket)
+    return jsonify(result), status
+
+@election_bp.route("/<int:election_id>/results/stream", methods=["GET"])
+def stream_election_results(election_id):
+    stream = stream_election_results_service(election_id)
+    if stream is None:
+        return jsonify({"error": "Election not found"}), 404
+    return Response(stream, mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # keep nginx from buffering the stream
+    })
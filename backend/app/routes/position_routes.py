@@ -1,4 +1,5 @@
 from flask import Blueprint, jsonify, request
+from ..utils.conditional import conditional
 
 position_bp = Blueprint("position", __name__)
 
@@ -7,6 +8,10 @@ def get_all_positions():
     if request.method == "OPTIONS":
         return "", 200
     
+    return conditional(("Positions",), _positions_body)
+
+
+def _positions_body():
     try:
         from ..models.position_model import get_all_positions
         positions = get_all_positions()
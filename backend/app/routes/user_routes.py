@@ -1,5 +1,6 @@
-from flask import Blueprint, jsonify, request
-from ..services.member_service import get_user_joined_clubs, get_user_all_clubs, get_user_headed_clubs
+from flask import Blueprint, request
+from ..services.member_service import get_user_joined_clubs, get_user_all_clubs, get_user_headed_clubs, USER_CLUBS_PAGE_KEY
+from ..utils.pagination import paginate
 
 user_bp = Blueprint("user", __name__)
 
@@ -10,8 +11,7 @@ def joined_clubs(reg_no):
     """
     if request.method == "OPTIONS":
         return "", 200
-    clubs = get_user_joined_clubs(reg_no)
-    return jsonify(clubs), 200
+    return paginate(lambda *page: get_user_joined_clubs(reg_no, *page), USER_CLUBS_PAGE_KEY)
 
 @user_bp.route("/<reg_no>/memberships", methods=["GET", "OPTIONS"])
 def all_clubs(reg_no):
@@ -20,8 +20,7 @@ def all_clubs(reg_no):
     """
     if request.method == "OPTIONS":
         return "", 200
-    memberships = get_user_all_clubs(reg_no)
-    return jsonify(memberships), 200
+    return paginate(lambda *page: get_user_all_clubs(reg_no, *page), USER_CLUBS_PAGE_KEY)
 
 @user_bp.route("/<reg_no>/headed-clubs", methods=["GET", "OPTIONS"])
 def headed_clubs(reg_no):
@@ -30,5 +29,4 @@ def headed_clubs(reg_no):
     """
     if request.method == "OPTIONS":
         return "", 200
-    clubs = get_user_headed_clubs(reg_no)
-    return jsonify(clubs), 200
+    return paginate(lambda *page: get_user_headed_clubs(reg_no, *page), USER_CLUBS_PAGE_KEY)
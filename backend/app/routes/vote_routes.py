@@ -1,5 +1,5 @@
 from flask import Blueprint, jsonify, request
-from ..services.votes_service import vote_service
+from ..services.votes_service import vote_service, vote_ingest_stats_service, recount_service
 
 
 vote_bp = Blueprint("vote",__name__)
@@ -13,6 +13,9 @@ def recording_vote(election_id):
     candidate_id = data.get("candidate_id")
     if not all([reg_no,candidate_id]):
         return jsonify({"error": "Missing required fields"}), 400
+    # Ballots are queued and committed in batches; a value SQLite can't bind must never get that far
+    if not isinstance(reg_no, str) or isinstance(candidate_id, bool) or not isinstance(candidate_id, (int, str)):
+        return jsonify({"error": "reg_no must be a string and candidate_id a number"}), 400
     success , status  = vote_service(reg_no,election_id,candidate_id)
     return jsonify(success),status
 
@@ -28,4 +31,42 @@ def check_vote_status(election_id, reg_no):
         has_voted = check_already_voted(reg_no, election_id)  # check_already_voted returns True if voted
         return jsonify({"has_voted": has_voted}), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+# bulk vote checking: /vote/check/<reg_no>?election_ids=1,2,3
+
+@vote_bp.route('/check/<string:reg_no>',methods=["GET","OPTIONS"])
+def check_vote_status_bulk(reg_no):
+    if request.method == "OPTIONS":
+        return "", 200
+
+    raw_ids = request.args.get("election_ids", "")
+    try:
+        election_ids = [int(i) for i in raw_ids.split(",") if i.strip()]
+    except ValueError:
+        return jsonify({"error": "election_ids must be a comma separated list of integers"}), 400
+    if not election_ids:
+        return jsonify({"error": "Missing election_ids"}), 400
+
+    try:
+        from ..services.votes_service import check_already_voted_bulk
+        has_voted = check_already_voted_bulk(reg_no, election_ids)
+        return jsonify({"has_voted": {str(k): v for k, v in has_voted.items()}}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@vote_bp.route('/ingest/stats',methods=["GET"])
+def vote_ingest_stats():
+    return jsonify(vote_ingest_stats_service()),200
+
+# tally audit: /vote/recount?admin=<reg_no>[&election_id=<id>]
+
+@vote_bp.route('/recount',methods=["GET","OPTIONS"])
+def recount_votes():
+    if request.method == "OPTIONS":
+        return "", 200
+    election_id = request.args.get("election_id", type=int)
+    if "election_id" in request.args and election_id is None:
+        return jsonify({"error": "election_id must be an integer"}), 400
+    report, status = recount_service(request.args.get("admin"), election_id)
+    return jsonify(report), status
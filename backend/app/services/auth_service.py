@@ -1,4 +1,11 @@
-from ..models.user_model import add_user, get_user_by_reg_no, verify_password
+import os
+from ..models.user_model import add_user, add_users, find_existing_reg_nos, get_user_by_reg_no, get_user_role, verify_password
+from ..utils import password_pool, role_cache
+
+USER_IMPORT_CHUNK_ROWS = int(os.environ.get("USER_IMPORT_CHUNK_ROWS", 500))
+# Row-level problems echoed back in the import report; the rest are only counted
+USER_IMPORT_MAX_ERRORS = int(os.environ.get("USER_IMPORT_MAX_ERRORS", 50))
+USER_IMPORT_HEADER = ["reg_no", "name", "password"]
 
 def register_user(reg_no, password, name):
     if get_user_by_reg_no(reg_no):
@@ -6,8 +13,102 @@ def register_user(reg_no, password, name):
     add_user(reg_no, password, name)
     return True, "registered"
 
+def import_users(rows):
+    """
+    Imports users from (reg_no, name, password) rows, e.g. a csv.reader over
+    an upload, USER_IMPORT_CHUNK_ROWS at a time. Each chunk costs one lookup
+    to skip reg_nos that already exist, parallel hashing of the rest on the
+    password pool, and one executemany in its own transaction. Yields the
+    running totals after every chunk; the last one has "done": True.
+    """
+    totals = {"processed": 0, "imported": 0, "skipped": 0, "invalid": 0, "errors": [], "done": False}
+
+    def reject(line, error):
+        totals["invalid"] += 1
+        if len(totals["errors"]) < USER_IMPORT_MAX_ERRORS:
+            totals["errors"].append({"line": line, "error": error})
+
+    def flush(chunk):
+        existing = find_existing_reg_nos(list(chunk))
+        new = [(reg_no, name, password) for reg_no, (name, password) in chunk.items() if reg_no not in existing]
+        hashes = password_pool.hash_passwords([password for _, _, password in new])
+        imported = add_users([(reg_no, password_hash, name) for (reg_no, name, _), password_hash in zip(new, hashes)])
+        totals["imported"] += imported
+        totals["skipped"] += len(chunk) - imported
+
+    chunk = {}
+    for line, row in enumerate(rows, start=1):
+        if line == 1 and [field.strip().lower() for field in row] == USER_IMPORT_HEADER:
+            continue
+        if not row or not any(field.strip() for field in row):
+            continue
+        totals["processed"] += 1
+        if len(row) != 3:
+            reject(line, "expected reg_no,name,password")
+            continue
+        reg_no, name, password = row[0].strip(), row[1].strip(), row[2]
+        if not reg_no or not name or not password:
+            reject(line, "reg_no, name and password are required")
+        elif len(reg_no) > 10:
+            reject(line, "reg_no is longer than 10 characters")
+        elif len(password) < 6:
+            reject(line, "password is shorter than 6 characters")
+        elif reg_no in chunk:
+            totals["skipped"] += 1  # repeated within the chunk; earlier chunks are caught by the lookup
+        else:
+            chunk[reg_no] = (name, password)
+            if len(chunk) >= USER_IMPORT_CHUNK_ROWS:
+                flush(chunk)
+                chunk = {}
+                yield _snapshot(totals)
+
+    if chunk:
+        flush(chunk)
+    totals["done"] = True
+    yield _snapshot(totals)
+
+def _snapshot(totals):
+    return {**totals, "errors": list(totals["errors"])}
+
+def import_users_service(admin_reg_no, rows):
+    """Admin-only wrapper around import_users: (progress generator, None) or (None, (error, status))."""
+    role = get_user_role(admin_reg_no)
+    if not role:
+        return None, ({"error": "Admin user not found"}, 404)
+    if role.lower() != "admin":
+        return None, ({"error": "Unauthorized, only admins can import users"}, 403)
+    return import_users(rows), None
+
 def authenticate_user(reg_no, password):
+    """On success returns the session claims (reg_no, name, role, version) for the user."""
+    version = role_cache.claims_version()
     user = get_user_by_reg_no(reg_no)
     if not user or not verify_password(user, password):
         return False, "INVALID REGISTER NUMBER OR PASSWORD"
-    return True, user
+    return True, _claims(user, version)
+
+def _claims(user, version):
+    return {
+        "reg_no": user["reg_no"],
+        "name": user["name"],
+        "role": user["role"] or "user",  # Default to 'user' if no role found
+        "version": version,
+    }
+
+def session_user_service(reg_no, claims):
+    """
+    Returns up-to-date claims for the signed-in user. Claims from the session
+    cookie are reused unless a role change was logged after they were
+    issued; only then is the user row read again. None if the user is gone.
+    """
+    if claims and claims.get("reg_no") == reg_no and not role_cache.claims_stale(reg_no, claims.get("version", -1)):
+        return claims
+    version = role_cache.claims_version()
+    user = get_user_by_reg_no(reg_no)
+    return _claims(user, version) if user else None
+
+def public_user(claims):
+    return {"reg_no": claims["reg_no"], "name": claims["name"], "role": claims["role"]}
+
+def password_pool_stats_service():
+    return password_pool.get_stats()
@@ -1,6 +1,10 @@
 from ..models.candidate_model import create_candidate, get_single_candidate, get_candidates_by_election
 from ..models.election_model import get_club_id_of_election , get_election_by_id
 from ..models.member_model import get_member_role
+from ..models.results_model import compute_results, get_results_snapshot
+from ..utils import results_stream
+import json
+import queue
 
 def  register_candidate_service(election_id, reg_no, manifesto):
     
@@ -34,5 +38,56 @@ def  register_candidate_service(election_id, reg_no, manifesto):
 
 
 def get_election_candidates_service(election_id):
+    # Declared elections are served from their snapshot, ranked once at close
+    snapshot = get_results_snapshot(election_id)
+    if snapshot:
+        return snapshot["candidates"], 200
     candidates = get_candidates_by_election(election_id)
-    return candidates, 200
\ No newline at end of file
+    return candidates, 200
+
+
+def get_election_results_service(election_id):
+    """
+    Ranked results with vote shares, turnout and tie flags. "final" is True
+    once the results have been declared; until then they're computed live.
+    """
+    results = get_results_snapshot(election_id)
+    if results:
+        results["final"] = True
+        return results, 200
+    results = compute_results(election_id)
+    if results is None:
+        return {"error": "Election not found"}, 404
+    results["final"] = False
+    return results, 200
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_election_results_service(election_id):
+    """
+    Returns a generator of Server-Sent Events: one "snapshot" with the full
+    candidate list, then a "delta" whenever totals change. None if the
+    election doesn't exist.
+    """
+    if not get_club_id_of_election(election_id):
+        return None
+
+    def stream():
+        sub, candidates = results_stream.subscribe(election_id, get_candidates_by_election)
+        try:
+            yield _sse("snapshot", candidates)
+            while True:
+                try:
+                    delta = sub.get(timeout=results_stream.RESULTS_STREAM_HEARTBEAT_S)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if delta is results_stream.CLOSED:
+                    return  # fell too far behind; the client reconnects for a new snapshot
+                yield _sse("delta", delta)
+        finally:
+            results_stream.unsubscribe(election_id, sub)
+
+    return stream()
@@ -1,7 +1,7 @@
-from ..models.club_model import get_all_clubs,get_single_club
+from ..models.club_model import get_all_clubs,get_single_club, PAGE_KEY as CLUB_PAGE_KEY
 
-def fetch_clubs():
-    return get_all_clubs()
+def fetch_clubs(limit=None, after=None, stream=False):
+    return get_all_clubs(limit, after, stream)
 
 def fetch_single_club(club_id):
     return get_single_club(club_id)
@@ -1,6 +1,8 @@
-from ..models.election_model import create_election , get_all_elections, get_elections_by_status , get_election_by_id , delete_election , get_elections_by_club , update_election_status , get_club_id_of_election
+from ..models.election_model import create_election , get_all_elections, get_elections_by_status , get_election_by_id , delete_election , get_elections_by_club , update_election_status , get_club_id_of_election, get_election_window, PAGE_KEY as ELECTION_PAGE_KEY
 from ..models.member_model import get_member_role
+from ..models.results_model import declare_results
 from ..models.user_model import get_user_role
+import time
 
 def create_election_service(club_id, position_id, reg_no, start_time, end_time):
     
@@ -17,11 +19,11 @@ def create_election_service(club_id, position_id, reg_no, start_time, end_time):
 
     return create_election(club_id, position_id, reg_no, start_time, end_time)
 
-def fetch_all_elections():
-    return get_all_elections()
+def fetch_all_elections(limit=None, after=None, stream=False):
+    return get_all_elections(limit, after, stream)
 
-def fetch_elections_by_status(status):
-    return get_elections_by_status(status)
+def fetch_elections_by_status(status, limit=None, after=None, stream=False):
+    return get_elections_by_status(status, limit, after, stream)
 
 def get_single_election(election_id ):
     election = get_election_by_id(election_id)
@@ -29,8 +31,25 @@ def get_single_election(election_id ):
         return {"error": "Election not found"}, 404
     return election
 
-def get_club_elections(club_id):
-    return get_elections_by_club(club_id)
+def get_election_phase(election_id):
+    """
+    Returns (status, seconds until the status next changes) from the
+    election's schedule, or None if it doesn't exist. Used to validate
+    cached copies of the election without loading it.
+    """
+    window = get_election_window(election_id)
+    if not window:
+        return None
+    start, end = window
+    now = int(time.time())
+    if start > now:
+        return "upcoming", start - now
+    if end > now:
+        return "ongoing", end - now
+    return "completed", None
+
+def get_club_elections(club_id, limit=None, after=None, stream=False):
+    return get_elections_by_club(club_id, limit, after, stream)
 
 def delete_election_service(election_id, reg_no, club_id):
     # First check if user is a site-wide admin
@@ -46,11 +65,19 @@ def delete_election_service(election_id, reg_no, club_id):
         return {"error": "Unauthorized - only admins and club heads can delete elections"}, 403
     return delete_election(election_id)
 
+def _apply_status_change(election_id, new_status):
+    if not update_election_status(election_id, new_status):
+        return {"error": f"Election cannot be moved to '{new_status}' from its current schedule"}, 400
+    if new_status == "completed":
+        # Closing by hand declares straight away rather than on the next scheduler tick
+        declare_results(election_id)
+    return True
+
 def update_election_status_service(election_id, new_status, reg_no, club_id):
     # First check if user is a site-wide admin
     site_role = get_user_role(reg_no)
     if site_role == "admin":
-        return update_election_status(election_id, new_status)
+        return _apply_status_change(election_id, new_status)
     
     # If not admin, check club-specific role
     user_role = get_member_role(reg_no, club_id)
@@ -58,7 +85,7 @@ def update_election_status_service(election_id, new_status, reg_no, club_id):
         return {"error": "User not found or not a member of this club"}, 404 
     if user_role != "Head":
         return {"error": "Unauthorized - only admins and club heads can update election status"}, 403
-    return update_election_status(election_id, new_status)
+    return _apply_status_change(election_id, new_status)
 
 def get_club_id_of_election_service(election_id):
     election_club_id = get_club_id_of_election(election_id)
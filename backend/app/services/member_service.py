@@ -1,35 +1,90 @@
 
 from ..models import member_model
 from ..models.user_model import get_user_role
+from ..models.member_model import USER_CLUBS_PAGE_KEY, MEMBERS_PAGE_KEY, PENDING_PAGE_KEY
+import os
+
+BULK_MEMBERSHIP_MAX_ITEMS = int(os.environ.get("BULK_MEMBERSHIP_MAX_ITEMS", 5000))
 
 def request_membership(reg_no, club_id, role="Member"):
     
     # TODO: Check if already requested or approved
     return member_model.add_membership(reg_no, club_id, role)
 
-def get_user_joined_clubs(reg_no):
+def get_user_joined_clubs(reg_no, limit=None, after=None, stream=False):
 
-    return member_model.get_joined_clubs_of_users(reg_no)
+    return member_model.get_joined_clubs_of_users(reg_no, limit, after, stream)
 
-def get_user_all_clubs(reg_no):
+def get_user_all_clubs(reg_no, limit=None, after=None, stream=False):
     
-    return member_model.get_all_clubs_of_users(reg_no)
+    return member_model.get_all_clubs_of_users(reg_no, limit, after, stream)
 
-def get_user_headed_clubs(reg_no):
+def get_user_headed_clubs(reg_no, limit=None, after=None, stream=False):
     """
     Returns all clubs where the user is the head.
     """
-    return member_model.get_clubs_headed_by_user(reg_no)
+    return member_model.get_clubs_headed_by_user(reg_no, limit, after, stream)
 
-def get_club_approved_members(club_id):
+def get_club_approved_members(club_id, limit=None, after=None, stream=False):
     
-    return member_model.get_approved_members_of_club(club_id)
+    return member_model.get_approved_members_of_club(club_id, limit, after, stream)
 
 def change_membership_status(reg_no, club_id, status):
     
     return member_model.update_membership_status(reg_no, club_id, status)
-def get_pending_requests_service():
-    return member_model.get_pending_requests()
+def get_pending_requests_service(limit=None, after=None, stream=False):
+    return member_model.get_pending_requests(limit, after, stream)
+
+def _require_admin(admin_reg_no):
+    role = get_user_role(admin_reg_no)
+    if not role:
+        return {"error": "Admin user not found"}, 404
+    if role.lower() != "admin":
+        return {"error": "Unauthorized, only admins can change memberships in bulk"}, 403
+    return None
+
+def bulk_change_membership_status_service(admin_reg_no, items):
+    """
+    items: [{"reg_no", "club_id", "status"}, ...]. Applied in one
+    transaction; the response lists a result for every item in order.
+    """
+    denied = _require_admin(admin_reg_no)
+    if denied:
+        return denied
+    if not isinstance(items, list) or not items:
+        return {"error": "items must be a non-empty list"}, 400
+    if len(items) > BULK_MEMBERSHIP_MAX_ITEMS:
+        return {"error": f"At most {BULK_MEMBERSHIP_MAX_ITEMS} items per request"}, 400
+
+    changes = []
+    for item in items:
+        try:
+            changes.append((str(item["reg_no"]), int(item["club_id"]), item["status"]))
+        except (KeyError, TypeError, ValueError):
+            return {"error": "Each item needs reg_no, club_id and status"}, 400
+
+    outcomes = member_model.update_membership_statuses(changes)
+    if outcomes is None:
+        return {"error": "Failed to update membership statuses"}, 500
+    results = [
+        {"reg_no": reg_no, "club_id": club_id, "status": status, "result": outcome}
+        for (reg_no, club_id, status), outcome in zip(changes, outcomes)
+    ]
+    return {"updated": outcomes.count("updated"), "results": results}, 200
+
+def resolve_pending_requests_service(admin_reg_no, club_id, status):
+    """Approves or rejects every pending request of a club at once."""
+    denied = _require_admin(admin_reg_no)
+    if denied:
+        return denied
+    if status not in ("approved", "rejected"):
+        return {"error": "status must be 'approved' or 'rejected'"}, 400
+
+    reg_nos = member_model.resolve_pending_memberships(club_id, status)
+    if reg_nos is None:
+        return {"error": "Failed to update membership statuses"}, 500
+    results = [{"reg_no": reg_no, "club_id": club_id, "status": status, "result": "updated"} for reg_no in reg_nos]
+    return {"updated": len(results), "results": results}, 200
 
 def upgrade_to_head_service(admin_reg_no, membership_id):
     role = get_user_role(admin_reg_no)    
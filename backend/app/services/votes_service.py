@@ -1,7 +1,29 @@
-from ..models.vote_model import add_vote_record, check_vote
-from ..models.election_model import get_election_by_id  
-from ..models.member_model import get_member_role
-from ..models.candidate_model import increment_vote, get_candidate_by_candidate_id
+from ..models.vote_model import add_vote_record, check_vote, check_votes, cast_vote
+from ..models.turnout_model import get_vote_buckets, get_club_election_votes
+from ..models.election_model import get_election_window, get_club_id_of_election
+from ..models.member_model import count_approved_members
+from ..models.club_model import get_single_club
+from ..models.user_model import get_user_role
+from ..utils import recount, vote_batcher
+import os
+import time
+
+# Chart bucket widths in minutes, finest first. Widths in whole hours are
+# summed from the hourly rollups, the rest from the per-minute ones.
+TURNOUT_BUCKET_MINUTES = (1, 5, 15, 30, 60, 180, 360, 720, 1440)
+# Points aimed for when the caller doesn't pick a width, and the most allowed when they do
+TURNOUT_TARGET_POINTS = int(os.environ.get("TURNOUT_TARGET_POINTS", 120))
+TURNOUT_MAX_POINTS = int(os.environ.get("TURNOUT_MAX_POINTS", 1440))
+
+CAST_VOTE_RESPONSES = {
+    "recorded": ({"msg": "vote recorded"}, 200),
+    "election_not_found": ({"error": "Election not found"}, 404),
+    "not_ongoing": ({"error": "Election is not open for voting"}, 400),
+    "invalid_candidate": ({"error": "Invalid candidate"}, 404),
+    "wrong_election": ({"error": "Candidate does not belong to this election"}, 400),
+    "not_member": ({"error": "User not found in this club"}, 404),
+    "already_voted": ({"msg": "already voted"}, 400),
+}
 
 def add_voting_record_service(reg_no,election_id):
     return add_vote_record(reg_no,election_id)
@@ -9,31 +31,120 @@ def add_voting_record_service(reg_no,election_id):
 def check_already_voted(reg_no,election_id):
     return check_vote(reg_no,election_id)
 
+def check_already_voted_bulk(reg_no, election_ids):
+    return check_votes(reg_no, election_ids)
+
 def vote_service(reg_no,election_id,candidate_id):
+    # eligibility checks, ballot insert and tally increment happen in one transaction
+    if vote_batcher.VOTE_BATCHING:
+        outcome = vote_batcher.submit_vote(reg_no, election_id, candidate_id)
+    else:
+        outcome = cast_vote(reg_no, election_id, candidate_id)
+    return CAST_VOTE_RESPONSES[outcome]
+
+def vote_ingest_stats_service():
+    return vote_batcher.get_stats()
+
+def recount_service(admin_reg_no, election_id=None):
+    """
+    Admin-only tally audit: every election, or just election_id. Runs on
+    threads (see utils/recount.py); the CLI recount.py uses processes.
+    """
+    role = get_user_role(admin_reg_no)
+    if not role:
+        return {"error": "Admin user not found"}, 404
+    if role.lower() != "admin":
+        return {"error": "Unauthorized, only admins can run a recount"}, 403
+    if election_id is not None and not get_election_window(election_id):
+        return {"error": "Election not found"}, 404
+    return recount.recount(None if election_id is None else [election_id]), 200
+
+def _iso(epoch):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(epoch))
+
+def _turnout(votes, eligible):
+    return round(votes / eligible, 4) if eligible else 0.0
+
+def election_turnout_service(election_id, bucket_minutes=None):
+    """
+    Cumulative turnout of an election over its voting window so far, in
+    buckets of bucket_minutes (picked from the window length if None),
+    read from the vote rollups alone.
+    """
+    window = get_election_window(election_id)
+    if not window:
+        return {"error": "Election not found"}, 404
+    start, end = window
+    until = max(start, min(end, int(time.time())))
+    span = max(until - start, 60)
+
+    if bucket_minutes is None:
+        bucket_minutes = next(
+            (m for m in TURNOUT_BUCKET_MINUTES if span / (m * 60) <= TURNOUT_TARGET_POINTS), TURNOUT_BUCKET_MINUTES[-1]
+        )
+    elif bucket_minutes not in TURNOUT_BUCKET_MINUTES:
+        return {"error": f"bucket must be one of {', '.join(map(str, TURNOUT_BUCKET_MINUTES))} minutes"}, 400
+    elif span / (bucket_minutes * 60) > TURNOUT_MAX_POINTS:
+        return {"error": f"bucket too fine for this election; at most {TURNOUT_MAX_POINTS} points"}, 400
+
+    width = bucket_minutes * 60
+    # Nothing to chart before the election opens
+    buckets = range(start // width * width, until, width) if until > start else range(0)
+    votes = {}
+    if buckets:
+        resolution = 3600 if width % 3600 == 0 else 60
+        for bucket_start, count in get_vote_buckets(election_id, resolution, buckets.start, until):
+            key = bucket_start // width * width
+            votes[key] = votes.get(key, 0) + count
+
+    eligible = count_approved_members(get_club_id_of_election(election_id))
+    series = []
+    cumulative = 0
+    for bucket_start in buckets:
+        cumulative += votes.get(bucket_start, 0)
+        series.append({
+            "time": _iso(bucket_start),
+            "votes": votes.get(bucket_start, 0),
+            "cumulative": cumulative,
+            "turnout": _turnout(cumulative, eligible),
+        })
+    return {
+        "election_id": election_id,
+        "eligible_voters": eligible,
+        "votes_cast": cumulative,
+        "turnout": _turnout(cumulative, eligible),
+        "bucket_minutes": bucket_minutes,
+        "series": series,
+    }, 200
 
-    #check if election is ongoing
-    election = get_election_by_id(election_id)
-    if election['status'] != 'ongoing':
-        return {"error": "Election is not open for voting"}, 400
-    club_id  = election['club_id']
-
-    #check if candidate is valid
-    check_candidate = get_candidate_by_candidate_id(candidate_id)
-    if not check_candidate:
-        return {"error": "Invalid candidate"}, 404
-    if check_candidate['election_id'] != election_id:
-        return {"error": "Candidate does not belong to this election"}, 400 
-
-    #check if user is a valid member of the club
-    user_role_in_club = get_member_role(reg_no , club_id)
-    if not user_role_in_club:
-        return {"error": "User not found in this club"}, 404
-    
-    #check if user has already voted in this election
-    if not check_already_voted(reg_no,election_id):
-        add_voting_record_service(reg_no,election_id)
-        increment_vote(candidate_id)
-        return {"msg":"vote recorded"},200
-    return {"msg":"already voted"},400
-
-    
\ No newline at end of file
+def club_turnout_service(club_id):
+    """
+    Turnout of every election a club has held, against its current approved
+    members, plus the overall participation rate across the ones that have
+    opened.
+    """
+    elections = get_club_election_votes(club_id)
+    if not elections and not get_single_club(club_id):
+        return {"error": "Club not found"}, 404
+    eligible = count_approved_members(club_id)
+    now = int(time.time())
+    opened = [e for e in elections if e["start_epoch"] <= now]
+    total_votes = sum(e["votes_cast"] for e in opened)
+    return {
+        "club_id": club_id,
+        "eligible_voters": eligible,
+        "elections_held": len(opened),
+        "votes_cast": total_votes,
+        "participation": _turnout(total_votes, eligible * len(opened)),
+        "elections": [
+            {
+                "election_id": e["election_id"],
+                "position_name": e["position_name"],
+                "start_time": e["start_time"],
+                "end_time": e["end_time"],
+                "votes_cast": e["votes_cast"],
+                "turnout": _turnout(e["votes_cast"], eligible),
+            }
+            for e in elections
+        ],
+    }, 200
@@ -0,0 +1,73 @@
+# app/utils/conditional.py
+"""
+Conditional GET for rarely-changing reads. Triggers bump TableVersions on
+every write to the tables a response depends on; the ETag is a hash of those
+versions (plus the request path and any extra validator), so a matching
+If-None-Match is answered 304 after one primary-key lookup, without running
+the route's model query or serializing anything. Last-Modified comes from
+the same rows, and Cache-Control max-age lets browsers skip the request
+entirely for a short while.
+
+Last-Modified only has one-second resolution, so it is sent (and
+If-Modified-Since honoured) only once the second of the latest change has
+passed; until then another write could land in that same second unseen.
+"""
+import hashlib
+import math
+import os
+import time
+from datetime import datetime, timezone
+from flask import Response, make_response, request
+from .db import get_db
+
+REFERENCE_MAX_AGE_S = int(os.environ.get("REFERENCE_MAX_AGE_S", 60))
+
+
+def table_versions(tables):
+    """Returns ({table: version}, newest updated_at) for the given tables."""
+    placeholders = ", ".join("?" * len(tables))
+    rows = get_db().execute(
+        f"SELECT name, version, updated_at FROM TableVersions WHERE name IN ({placeholders})", tuple(tables)
+    ).fetchall()
+    return {row[0]: row[1] for row in rows}, max((row[2] for row in rows), default=0)
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        # If-None-Match wins over If-Modified-Since when both are sent
+        return request.if_none_match.contains_weak(etag)
+    return (
+        last_modified is not None
+        and request.if_modified_since is not None
+        and last_modified <= request.if_modified_since
+    )
+
+
+def conditional(tables, load, extra=(), max_age=REFERENCE_MAX_AGE_S):
+    """
+    Serves load() (anything a view may return) with ETag/Last-Modified
+    validators derived from the versions of tables, or a bare 304 if the
+    client's copy is still current. extra adds validator values the tables
+    alone don't capture; pass None to skip validation (e.g. a missing row).
+    """
+    if extra is None:
+        return load()
+    versions, updated_at = table_versions(tables)
+    validator = repr((request.full_path, sorted(versions.items()), extra))
+    etag = hashlib.sha1(validator.encode()).hexdigest()[:20]
+    # Rounded up so the header is never earlier than the change itself
+    changed_s = math.ceil(updated_at)
+    last_modified = datetime.fromtimestamp(changed_s, timezone.utc) if changed_s <= time.time() else None
+
+    if _not_modified(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = make_response(load())
+        if response.status_code != 200:
+            return response
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response
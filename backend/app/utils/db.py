@@ -1,12 +1,142 @@
+import itertools
 import sqlite3
 import os
+import queue
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+from flask import g, has_app_context
+from .metrics import CONNECTION_ACQUIRE
 
 DB_NAME = "Voting_System.db"
 # Database is in the backend folder, utils is at backend/app/utils, so go up 2 levels
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../..", DB_NAME)
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
+# --- Connection tuning (env overridable) ---
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 8))
+BUSY_TIMEOUT_MS = int(os.environ.get("DB_BUSY_TIMEOUT_MS", 5000))
+CACHE_SIZE_KB = int(os.environ.get("DB_CACHE_SIZE_KB", 16384))
+MMAP_SIZE = int(os.environ.get("DB_MMAP_SIZE", 128 * 1024 * 1024))
+SYNCHRONOUS = os.environ.get("DB_SYNCHRONOUS", "NORMAL")
+# Bounded LRU of prepared statements kept by each sqlite3 connection
+STATEMENT_CACHE_SIZE = int(os.environ.get("DB_STATEMENT_CACHE_SIZE", 256))
+# Rows pulled per fetchmany() when a listing is streamed
+FETCH_MANY_SIZE = int(os.environ.get("DB_FETCH_MANY_SIZE", 500))
+
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+_local = threading.local()
+
+
+def _connect():
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False,  # pooled connections move between request threads
+    )
     conn.row_factory = sqlite3.Row
+    # Pragmas are applied once per physical connection, not per model call
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA synchronous = {SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA temp_store = MEMORY")
     conn.execute("PRAGMA foreign_keys = ON")
-    return conn, conn.cursor()
+    return conn
+
+
+def _acquire():
+    started = perf_counter()
+    try:
+        conn, source = _pool.get_nowait(), "pool"
+    except queue.Empty:
+        conn, source = _connect(), "new"
+    CONNECTION_ACQUIRE.observe((source,), perf_counter() - started)
+    return conn
+
+
+def _release(conn):
+    # Never hand a connection with a half-finished transaction to the next request
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+def get_db():
+    """
+    Returns the connection bound to the current Flask app context, or to the
+    current thread when called outside one (scheduler jobs, scripts).
+    Callers must not close it.
+    """
+    if has_app_context():
+        if "db_conn" not in g:
+            g.db_conn = _acquire()
+        return g.db_conn
+
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        started = perf_counter()
+        conn = _local.conn = _connect()
+        CONNECTION_ACQUIRE.observe(("thread",), perf_counter() - started)
+    return conn
+
+
+def release_db(exc=None):
+    conn = g.pop("db_conn", None)
+    if conn is not None:
+        _release(conn)
+
+
+def init_app(app):
+    app.teardown_appcontext(release_db)
+
+
+@contextmanager
+def immediate_transaction():
+    """
+    Runs the block inside BEGIN IMMEDIATE so the write lock is taken up front
+    instead of being upgraded mid-transaction. Commits on success, rolls back
+    on any exception.
+    """
+    conn = get_db()
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def _tuple_rows(cur):
+    # Rows are fetched as plain tuples and zipped with the column names in C;
+    # building sqlite3.Row objects only to copy them into dicts costs twice
+    cur.row_factory = None
+    return [column[0] for column in cur.description]
+
+
+def iter_dicts(cur):
+    """Yields the cursor's rows as dicts, FETCH_MANY_SIZE at a time. Closes the cursor when done or abandoned."""
+    try:
+        columns = _tuple_rows(cur)
+        while True:
+            rows = cur.fetchmany(FETCH_MANY_SIZE)
+            if not rows:
+                return
+            yield from map(dict, map(zip, itertools.repeat(columns), rows))
+    finally:
+        cur.close()
+
+
+def fetch_dicts(cur, stream=False):
+    """Rows as a list of dicts, or as a lazy generator when stream is set."""
+    if stream:
+        return iter_dicts(cur)
+    columns = _tuple_rows(cur)
+    return list(map(dict, map(zip, itertools.repeat(columns), cur.fetchall())))
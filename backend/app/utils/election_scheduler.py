@@ -1,37 +1,86 @@
 # app/utils/election_scheduler.py
 from apscheduler.schedulers.background import BackgroundScheduler
 import atexit
-from datetime import datetime, timedelta
-from ..services.election_service import fetch_elections_by_status, update_election_status
+import os
+import socket
+import time
+import uuid
+from datetime import datetime
+from ..models.election_model import sync_election_statuses
+from ..models.lease_model import try_acquire_lease, release_lease
+from ..models.results_model import declare_pending_results
+from .metrics import ELECTION_TRANSITIONS, RESULTS_DECLARED, SCHEDULER_TICK
 
 scheduler = None  # global scheduler
 
+# Every worker runs the scheduler, but only the holder of this lease acts on ticks.
+LEASE_NAME = "election_scheduler"
+LEASE_TTL_S = float(os.environ.get("SCHEDULER_LEASE_TTL_S", 15))
+LEASE_HEARTBEAT_S = float(os.environ.get("SCHEDULER_LEASE_HEARTBEAT_S", 5))
+
+holder_id = None
+lease_expires_at = 0.0  # local view of our own lease; 0 when not leader
+
 def check_and_update_elections():
-    now = datetime.utcnow()
-
-    # --- Upcoming → Ongoing ---
-    upcoming_elections = fetch_elections_by_status("upcoming")
-    for election in upcoming_elections:
-        start_time = datetime.fromisoformat(election["start_time"])
-        if now >= start_time:
-            update_election_status(election["election_id"], "ongoing")
-            print(f"Election {election['election_id']} moved to ongoing.")
-
-    # --- Ongoing → Completed ---
-    ongoing_elections = fetch_elections_by_status("ongoing")
-    for election in ongoing_elections:
-        end_time = datetime.fromisoformat(election["end_time"])
-        if now >= end_time:
-            update_election_status(election["election_id"], "completed")
-            print(f"Election {election['election_id']} moved to completed.")
+    # Status is derived from start/end time at query time; this only keeps the
+    # cached Elections.status column in step, via the epoch indexes.
+    started = time.perf_counter()
+    for election_id, status in sync_election_statuses():
+        print(f"Election {election_id} moved to {status}.")
+        ELECTION_TRANSITIONS.inc((status,))
+    # Snapshot the final results of elections that just completed (and any
+    # backlog from before snapshots existed), so they are never re-ranked
+    declared = declare_pending_results()
+    if len(declared) > 10:
+        print(f"Results declared for {len(declared)} elections.")
+    else:
+        for election_id in declared:
+            print(f"Results declared for election {election_id}.")
+    RESULTS_DECLARED.inc((), len(declared))
+    SCHEDULER_TICK.observe((), time.perf_counter() - started)
+
+def is_leader():
+    return time.time() < lease_expires_at
+
+def renew_lease():
+    global lease_expires_at
+    was_leader = is_leader()
+    now = time.time()
+    if try_acquire_lease(LEASE_NAME, holder_id, now, LEASE_TTL_S):
+        lease_expires_at = now + LEASE_TTL_S
+        if not was_leader:
+            print(f"Election scheduler leadership acquired by {holder_id}")
+            # Catch up straight away in case the previous leader died mid-interval
+            check_and_update_elections()
+    else:
+        if was_leader:
+            print(f"Election scheduler leadership lost by {holder_id}")
+        lease_expires_at = 0.0
+
+def leader_tick():
+    if is_leader():
+        check_and_update_elections()
+
+def stop_scheduler():
+    global lease_expires_at
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    if is_leader():
+        # Let a standby take over on its next heartbeat instead of after the TTL
+        release_lease(LEASE_NAME, holder_id)
+        lease_expires_at = 0.0
 
 def start_scheduler():
-    global scheduler
+    global scheduler, holder_id
     if scheduler is None:  # only start once
+        holder_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
         scheduler = BackgroundScheduler()
-        scheduler.add_job(func=check_and_update_elections, trigger="interval", minutes=10)
+        scheduler.add_job(func=renew_lease, trigger="interval", seconds=LEASE_HEARTBEAT_S,
+                          next_run_time=datetime.now(), max_instances=1, coalesce=True)
+        scheduler.add_job(func=leader_tick, trigger="interval", minutes=10)
         scheduler.start()
         print("Election scheduler started ✅")
 
         # Shutdown scheduler on app exit
-        atexit.register(lambda: scheduler.shutdown())
+        atexit.register(stop_scheduler)
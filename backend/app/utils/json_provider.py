@@ -0,0 +1,58 @@
+# app/utils/json_provider.py
+"""
+Flask JSON provider backed by orjson, if it is installed. jsonify() and the
+streamed listings then encode straight to bytes in C instead of walking
+every dict with the stdlib encoder and re-encoding the resulting str.
+Output matches the default provider's (sorted keys, compact). Without
+orjson, or with FAST_JSON=0, the stock provider is used.
+"""
+import os
+import sqlite3
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+FAST_JSON = os.environ.get("FAST_JSON", "1") == "1"
+
+
+def _default(obj):
+    if isinstance(obj, sqlite3.Row):
+        return dict(obj)
+    return DefaultJSONProvider.default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    def _options(self):
+        # Non-str keys: the stdlib encoder turns {1: True} into {"1": true}, orjson refuses unless asked
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj, **kwargs):
+        # orjson output is always compact; anything beyond separators needs the stdlib encoder
+        kwargs.pop("separators", None)
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            # Pretty-printed output for debugging stays on the stdlib encoder
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_app(app):
+    if FAST_JSON and orjson is not None:
+        app.json = FastJSONProvider(app)
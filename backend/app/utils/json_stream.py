@@ -0,0 +1,43 @@
+# app/utils/json_stream.py
+"""
+Chunked JSON array responses for large listings. Rows come from a model
+generator (see db.iter_dicts) and are encoded STREAM_CHUNK_ROWS at a time,
+one app JSON provider call per chunk, so neither the row dicts nor the full
+body are ever held in memory at once. json_lines_response streams
+progress reports the same way, one JSON document per line.
+"""
+import functools
+import itertools
+import os
+from flask import Response, current_app, stream_with_context
+
+STREAM_CHUNK_ROWS = int(os.environ.get("STREAM_CHUNK_ROWS", 200))
+
+
+def _encode(items, dumps):
+    yield "["
+    separator = ""
+    while True:
+        chunk = list(itertools.islice(items, STREAM_CHUNK_ROWS))
+        if not chunk:
+            break
+        # Encode the chunk as one array and drop its brackets
+        yield separator + dumps(chunk)[1:-1]
+        separator = ","
+    yield "]"
+
+
+def json_array_response(items, status=200, headers=None):
+    """Streams an iterable of JSON-serialisable rows as one JSON array."""
+    # stream_with_context keeps the request (and its pooled connection) alive
+    # until the last chunk has been sent
+    dumps = functools.partial(current_app.json.dumps, separators=(",", ":"))
+    body = stream_with_context(_encode(iter(items), dumps))
+    return Response(body, status=status, headers=headers, mimetype="application/json")
+
+
+def json_lines_response(items, status=200, headers=None):
+    """Streams an iterable of JSON-serialisable items as newline-delimited JSON, flushing after each."""
+    dumps = functools.partial(current_app.json.dumps, separators=(",", ":"))
+    body = stream_with_context(dumps(item) + "\n" for item in items)
+    return Response(body, status=status, headers=headers, mimetype="application/x-ndjson")
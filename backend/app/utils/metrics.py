@@ -0,0 +1,202 @@
+# app/utils/metrics.py
+"""
+In-process metrics, served on /metrics in the Prometheus text format.
+Latency histograms cover every request (by blueprint and route), every
+public model function (one series per module.function, registered by
+instrument_module), connection acquisition and scheduler ticks; the stats
+the worker pools already keep are exported as gauges. An observation is a
+perf_counter pair, a bisect and one locked increment, so it stays on in
+production; METRICS_ENABLED=0 leaves requests and model calls untimed and
+drops the endpoint.
+
+Numbers are per process: scrape each gunicorn worker separately rather
+than expecting them summed. Streamed responses are timed until the
+response object is ready, not until the last chunk is sent.
+"""
+import functools
+import inspect
+import os
+import sys
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from flask import Response, g, request
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+METRICS_PREFIX = "voting_"
+
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+
+_registry = []
+_stats_sources = {}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=REQUEST_BUCKETS):
+        self.name = METRICS_PREFIX + name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [per-bucket counts (last is +Inf), sum]
+        if not self.labelnames:
+            self._series[()] = [[0] * (len(self.buckets) + 1), 0.0]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self):
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, counts, total in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {total}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = METRICS_PREFIX + name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {} if self.labelnames else {(): 0}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self):
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in snapshot:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value}"
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to build the response, by blueprint and route.",
+    ("blueprint", "route", "method", "status"),
+)
+QUERY_LATENCY = Histogram(
+    "model_query_duration_seconds", "Duration of model layer calls, by module.function.",
+    ("query",), QUERY_BUCKETS,
+)
+CONNECTION_ACQUIRE = Histogram(
+    "db_connection_acquire_seconds", "Time to obtain a SQLite connection (pooled, newly opened, or thread-local).",
+    ("source",), QUERY_BUCKETS,
+)
+SCHEDULER_TICK = Histogram("scheduler_tick_duration_seconds", "Duration of election scheduler ticks run as leader.")
+ELECTION_TRANSITIONS = Counter(
+    "election_transitions_total", "Election status changes applied by the scheduler.", ("status",)
+)
+RESULTS_DECLARED = Counter("results_declared_total", "Election results snapshots stored by the scheduler.")
+
+
+def _timed(func, labels):
+    observe = QUERY_LATENCY.observe
+
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        started = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            observe(labels, perf_counter() - started)
+    return timed
+
+
+def instrument_module(module_name):
+    """
+    Times every public function defined in a model module as query
+    "<module>.<function>". Called at the bottom of the module, so callers
+    importing a function by name (including other models) get the timed one.
+    Functions returning a stream are timed until the generator is returned.
+    """
+    if not METRICS_ENABLED:
+        return
+    module = sys.modules[module_name]
+    short_name = module_name.rsplit(".", 1)[-1]
+    for name, func in list(vars(module).items()):
+        if inspect.isfunction(func) and func.__module__ == module_name and not name.startswith("_"):
+            setattr(module, name, _timed(func, (f"{short_name}.{name}",)))
+
+
+def register_stats(component, get_stats):
+    """Exports the numeric values of get_stats() as gauges named <component>_<key>."""
+    _stats_sources[component] = get_stats
+
+
+def _collect_stats():
+    for component, get_stats in _stats_sources.items():
+        for key, value in sorted(get_stats().items()):
+            if isinstance(value, (int, float)):
+                name = f"{METRICS_PREFIX}{component}_{key}"
+                yield f"# TYPE {name} gauge"
+                yield f"{name} {float(value)}"
+
+
+def render():
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.collect())
+    lines.extend(_collect_stats())
+    return "\n".join(lines) + "\n"
+
+
+def _start_timer():
+    g.request_started = perf_counter()
+
+
+def _observe_request(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        REQUEST_LATENCY.observe(
+            (request.blueprint or "app", route, request.method, str(response.status_code)),
+            perf_counter() - started,
+        )
+    return response
+
+
+def metrics_view():
+    return Response(render(), mimetype="text/plain; version=0.0.4")
+
+
+def init_app(app):
+    if not METRICS_ENABLED:
+        return
+    from . import password_pool, vote_batcher
+
+    register_stats("password_pool", password_pool.get_stats)
+    register_stats("vote_batcher", vote_batcher.get_stats)
+    app.before_request(_start_timer)
+    app.after_request(_observe_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
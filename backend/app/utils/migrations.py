@@ -0,0 +1,459 @@
+# app/utils/migrations.py
+"""
+Versioned schema migrations, tracked in PRAGMA user_version.
+
+Every step is idempotent (IF NOT EXISTS / column checks) so databases that
+were created by hand before this runner existed are brought forward safely.
+Each migration runs in its own BEGIN IMMEDIATE transaction; with the
+connection in WAL mode, readers keep working while indexes are built.
+"""
+from .db import get_db, immediate_transaction
+
+BASELINE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS Users(
+        reg_no CHAR(10) PRIMARY KEY,
+        password TEXT NOT NULL,
+        name VARCHAR(25) NOT NULL,
+        created_at TIMESTAMP,
+        role TEXT DEFAULT 'user' CHECK(role IN ('admin', 'user'))
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Positions (
+        position_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        position_name TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Clubs (
+        club_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        description TEXT,
+        logo_url TEXT,
+        head_id CHAR(10),
+        FOREIGN KEY (head_id) REFERENCES Users(reg_no)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ClubMemberships (
+        membership_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        reg_no CHAR(10) NOT NULL,
+        club_id INTEGER NOT NULL,
+        role TEXT NOT NULL DEFAULT 'Member' CHECK (role IN ('Head', 'Member')),
+        status TEXT NOT NULL DEFAULT 'pending' CHECK (
+            status IN ('pending', 'approved', 'rejected')
+        ),
+        join_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (reg_no) REFERENCES Users (reg_no) ON DELETE CASCADE,
+        FOREIGN KEY (club_id) REFERENCES Clubs (club_id) ON DELETE CASCADE,
+        UNIQUE (reg_no, club_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Elections (
+        election_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        club_id INTEGER NOT NULL,
+        position_id INTEGER NOT NULL,
+        start_time DATETIME NOT NULL,
+        end_time DATETIME NOT NULL,
+        status TEXT CHECK (
+            status IN ('upcoming', 'ongoing', 'completed')
+        ) DEFAULT 'upcoming',
+        result_declared BOOLEAN DEFAULT 0,
+        created_by CHAR(10) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (club_id) REFERENCES Clubs (club_id) ON DELETE CASCADE,
+        FOREIGN KEY (position_id) REFERENCES Positions (position_id) ON DELETE CASCADE,
+        FOREIGN KEY (created_by) REFERENCES Users (reg_no) ON DELETE SET NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Candidates (
+        candidate_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        election_id INTEGER NOT NULL,
+        reg_no CHAR(10) NOT NULL,
+        manifesto TEXT,
+        total_votes INTEGER DEFAULT 0,
+        FOREIGN KEY (election_id) REFERENCES Elections(election_id) ON DELETE CASCADE,
+        FOREIGN KEY (reg_no) REFERENCES Users(reg_no) ON DELETE CASCADE,
+        UNIQUE (election_id, reg_no)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Votes (
+        vote_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        reg_no TEXT NOT NULL,
+        election_id INTEGER NOT NULL,
+        voted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (reg_no, election_id),
+        FOREIGN KEY (reg_no) REFERENCES Users(reg_no) ON DELETE CASCADE,
+        FOREIGN KEY (election_id) REFERENCES Elections(election_id) ON DELETE CASCADE
+    )
+    """,
+]
+
+# Bumped by every change to Candidates; see utils/tally_cache.py
+TALLY_VERSIONS = [
+    """
+    CREATE TABLE IF NOT EXISTS TallyVersions(
+        election_id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_candidates_tally_insert
+    AFTER INSERT ON Candidates
+    BEGIN
+        INSERT INTO TallyVersions (election_id, version) VALUES (NEW.election_id, 1)
+        ON CONFLICT(election_id) DO UPDATE SET version = version + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_candidates_tally_update
+    AFTER UPDATE ON Candidates
+    BEGIN
+        INSERT INTO TallyVersions (election_id, version) VALUES (NEW.election_id, 1)
+        ON CONFLICT(election_id) DO UPDATE SET version = version + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_candidates_tally_delete
+    AFTER DELETE ON Candidates
+    BEGIN
+        INSERT INTO TallyVersions (election_id, version) VALUES (OLD.election_id, 1)
+        ON CONFLICT(election_id) DO UPDATE SET version = version + 1;
+    END
+    """,
+]
+
+# Leader lease for the election scheduler; see utils/election_scheduler.py
+LEASES = [
+    """
+    CREATE TABLE IF NOT EXISTS Leases(
+        name TEXT PRIMARY KEY,
+        holder TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+]
+
+
+def _election_epoch_columns(conn):
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(Elections)")}
+    if "start_epoch" not in columns:
+        conn.execute("ALTER TABLE Elections ADD COLUMN start_epoch INTEGER")
+    if "end_epoch" not in columns:
+        conn.execute("ALTER TABLE Elections ADD COLUMN end_epoch INTEGER")
+    for statement in [
+        """
+        UPDATE Elections
+        SET start_epoch = CAST(strftime('%s', start_time) AS INTEGER),
+            end_epoch = CAST(strftime('%s', end_time) AS INTEGER)
+        WHERE start_epoch IS NULL OR end_epoch IS NULL
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_elections_start_epoch ON Elections(start_epoch)",
+        "CREATE INDEX IF NOT EXISTS idx_elections_end_epoch ON Elections(end_epoch)",
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_elections_epoch_insert
+        AFTER INSERT ON Elections
+        BEGIN
+            UPDATE Elections
+            SET start_epoch = CAST(strftime('%s', NEW.start_time) AS INTEGER),
+                end_epoch = CAST(strftime('%s', NEW.end_time) AS INTEGER)
+            WHERE election_id = NEW.election_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_elections_epoch_update
+        AFTER UPDATE OF start_time, end_time ON Elections
+        BEGIN
+            UPDATE Elections
+            SET start_epoch = CAST(strftime('%s', NEW.start_time) AS INTEGER),
+                end_epoch = CAST(strftime('%s', NEW.end_time) AS INTEGER)
+            WHERE election_id = NEW.election_id;
+        END
+        """,
+    ]:
+        conn.execute(statement)
+
+
+# Secondary indexes for the hot model queries
+HOT_QUERY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_elections_club_start ON Elections(club_id, start_epoch)",
+    "CREATE INDEX IF NOT EXISTS idx_memberships_club_status ON ClubMemberships(club_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_memberships_status_join_date ON ClubMemberships(status, join_date)",
+    "CREATE INDEX IF NOT EXISTS idx_candidates_election_votes ON Candidates(election_id, total_votes DESC)",
+    "ANALYZE",
+]
+
+# Change log behind utils/role_cache.py. Keeps the most recent 10000 rows.
+ROLE_CHANGES = [
+    """
+    CREATE TABLE IF NOT EXISTS RoleChanges(
+        change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        reg_no CHAR(10) NOT NULL,
+        club_id INTEGER
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_role_changes_prune
+    AFTER INSERT ON RoleChanges
+    BEGIN
+        DELETE FROM RoleChanges WHERE change_id <= NEW.change_id - 10000;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_users_role_change
+    AFTER UPDATE OF role ON Users
+    BEGIN
+        INSERT INTO RoleChanges (reg_no, club_id) VALUES (NEW.reg_no, NULL);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_memberships_role_insert
+    AFTER INSERT ON ClubMemberships
+    BEGIN
+        INSERT INTO RoleChanges (reg_no, club_id) VALUES (NEW.reg_no, NEW.club_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_memberships_role_update
+    AFTER UPDATE OF role, status ON ClubMemberships
+    BEGIN
+        INSERT INTO RoleChanges (reg_no, club_id) VALUES (NEW.reg_no, NEW.club_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_memberships_role_delete
+    AFTER DELETE ON ClubMemberships
+    BEGIN
+        INSERT INTO RoleChanges (reg_no, club_id) VALUES (OLD.reg_no, OLD.club_id);
+    END
+    """,
+]
+
+# Per-table change counters behind conditional GETs (utils/conditional.py).
+# updated_at is a Unix timestamp with sub-second precision.
+_NOW_SQL = "(julianday('now') - 2440587.5) * 86400.0"
+
+
+def _table_version_bump(table):
+    return (
+        f"INSERT INTO TableVersions (name, version, updated_at) VALUES ('{table}', 1, {_NOW_SQL}) "
+        "ON CONFLICT(name) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at;"
+    )
+
+
+TABLE_VERSIONS = [
+    """
+    CREATE TABLE IF NOT EXISTS TableVersions(
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0,
+        updated_at REAL NOT NULL
+    )
+    """,
+    f"""
+    INSERT OR IGNORE INTO TableVersions (name, version, updated_at)
+    VALUES ('Positions', 1, {_NOW_SQL}), ('Clubs', 1, {_NOW_SQL}), ('Elections', 1, {_NOW_SQL})
+    """,
+] + [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{table.lower()}_version_{event.lower()}
+    AFTER {event} ON {table}
+    BEGIN
+        {_table_version_bump(table)}
+    END
+    """
+    for table in ("Positions", "Clubs", "Elections")
+    for event in ("INSERT", "UPDATE", "DELETE")
+]
+
+# Final results, written once when an election completes (models/results_model.py).
+# A row is only valid for the end_epoch it was computed at.
+ELECTION_RESULTS = [
+    """
+    CREATE TABLE IF NOT EXISTS ElectionResults(
+        election_id INTEGER PRIMARY KEY,
+        end_epoch INTEGER NOT NULL,
+        declared_at INTEGER NOT NULL,
+        eligible_voters INTEGER NOT NULL,
+        votes_cast INTEGER NOT NULL,
+        turnout REAL NOT NULL,
+        tied_for_first BOOLEAN NOT NULL,
+        candidates TEXT NOT NULL,
+        FOREIGN KEY (election_id) REFERENCES Elections(election_id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_election_results_immutable
+    BEFORE UPDATE ON ElectionResults
+    BEGIN
+        SELECT RAISE(ABORT, 'election results are immutable');
+    END
+    """,
+    # Completed elections still waiting for their snapshot. The planner
+    # passes over a partial index here in favour of idx_elections_status_end,
+    # which would walk every completed election
+    "CREATE INDEX IF NOT EXISTS idx_elections_undeclared ON Elections(status, result_declared, end_epoch)",
+]
+
+# Votes per election per minute and per hour, maintained by triggers on Votes
+# so turnout charts never scan Votes (models/turnout_model.py). bucket_start
+# is the Unix time the bucket begins at.
+_VOTED_AT = "CAST(strftime('%s', COALESCE({row}.voted_at, 'now')) AS INTEGER)"
+_NEW_VOTED_AT = _VOTED_AT.format(row="NEW")
+_OLD_VOTED_AT = _VOTED_AT.format(row="OLD")
+
+VOTE_ROLLUPS = [
+    """
+    CREATE TABLE IF NOT EXISTS VoteRollups(
+        election_id INTEGER NOT NULL,
+        bucket_s INTEGER NOT NULL,
+        bucket_start INTEGER NOT NULL,
+        votes INTEGER NOT NULL,
+        PRIMARY KEY (election_id, bucket_s, bucket_start),
+        FOREIGN KEY (election_id) REFERENCES Elections(election_id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_votes_rollup_insert
+    AFTER INSERT ON Votes
+    BEGIN
+        INSERT INTO VoteRollups (election_id, bucket_s, bucket_start, votes)
+        VALUES (NEW.election_id, 60, {_NEW_VOTED_AT} / 60 * 60, 1),
+               (NEW.election_id, 3600, {_NEW_VOTED_AT} / 3600 * 3600, 1)
+        ON CONFLICT(election_id, bucket_s, bucket_start) DO UPDATE SET votes = votes + 1;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_votes_rollup_delete
+    AFTER DELETE ON Votes
+    BEGIN
+        UPDATE VoteRollups SET votes = votes - 1
+        WHERE election_id = OLD.election_id AND bucket_s = 60 AND bucket_start = {_OLD_VOTED_AT} / 60 * 60;
+        UPDATE VoteRollups SET votes = votes - 1
+        WHERE election_id = OLD.election_id AND bucket_s = 3600 AND bucket_start = {_OLD_VOTED_AT} / 3600 * 3600;
+    END
+    """,
+] + [
+    # Backfill from the votes already cast
+    f"""
+    INSERT INTO VoteRollups (election_id, bucket_s, bucket_start, votes)
+    SELECT election_id, {width}, {_VOTED_AT.format(row="Votes")} / {width} * {width} AS bucket_start, COUNT(*)
+    FROM Votes
+    GROUP BY election_id, bucket_start
+    """
+    for width in (60, 3600)
+]
+
+# Append-only record of what each ballot chose, for recounts (utils/recount.py).
+# It has no voter column: Votes says who voted, Ballots what was chosen.
+# Ballots only go away with their election.
+BALLOTS = [
+    """
+    CREATE TABLE IF NOT EXISTS Ballots(
+        ballot_id INTEGER PRIMARY KEY,
+        election_id INTEGER NOT NULL,
+        candidate_id INTEGER NOT NULL,
+        FOREIGN KEY (election_id) REFERENCES Elections(election_id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_ballots_election_candidate ON Ballots(election_id, candidate_id)",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_ballots_no_update
+    BEFORE UPDATE ON Ballots
+    BEGIN
+        SELECT RAISE(ABORT, 'ballots are append-only');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_ballots_no_delete
+    BEFORE DELETE ON Ballots
+    WHEN EXISTS (SELECT 1 FROM Elections WHERE election_id = OLD.election_id)
+    BEGIN
+        SELECT RAISE(ABORT, 'ballots are append-only');
+    END
+    """,
+]
+
+
+def _ballots(conn):
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(Candidates)")}
+    if "baseline_votes" not in columns:
+        # Votes cast before ballots were recorded can't be recounted; recounts
+        # take them as given and verify everything on top
+        conn.execute("ALTER TABLE Candidates ADD COLUMN baseline_votes INTEGER NOT NULL DEFAULT 0")
+        conn.execute("UPDATE Candidates SET baseline_votes = total_votes")
+    for statement in BALLOTS:
+        conn.execute(statement)
+
+
+MIGRATIONS = [
+    (1, "baseline schema", BASELINE_SCHEMA),
+    (2, "tally versions", TALLY_VERSIONS),
+    (3, "scheduler leases", LEASES),
+    (4, "election epoch columns", _election_epoch_columns),
+    (5, "hot query indexes", HOT_QUERY_INDEXES),
+    (6, "election status sync index", [
+        # Lets sync_election_statuses seek the few stale rows instead of
+        # walking every completed election on each tick
+        "CREATE INDEX IF NOT EXISTS idx_elections_status_end ON Elections(status, end_epoch)",
+    ]),
+    (7, "role change log", ROLE_CHANGES),
+    (8, "site role change index", [
+        # role_cache rebuilds the per-user site-role watermarks from this
+        "CREATE INDEX IF NOT EXISTS idx_role_changes_site ON RoleChanges(club_id, reg_no)",
+    ]),
+    (9, "table versions", TABLE_VERSIONS),
+    (10, "election results snapshots", ELECTION_RESULTS),
+    (11, "vote rollups", VOTE_ROLLUPS),
+    (12, "ballots", _ballots),
+    (13, "user delete role change", [
+        # A deleted user's session claims must go stale like a role change would
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_users_delete_role_change
+        AFTER DELETE ON Users
+        BEGIN
+            INSERT INTO RoleChanges (reg_no, club_id) VALUES (OLD.reg_no, NULL);
+        END
+        """,
+    ]),
+    (14, "user name versions", [
+        # Election responses carry created_by_name; new users can't be referenced yet,
+        # so only renames and deletes need to move the validator
+        f"INSERT OR IGNORE INTO TableVersions (name, version, updated_at) VALUES ('Users', 1, {_NOW_SQL})",
+    ] + [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_users_version_{name}
+        AFTER {event} ON Users
+        BEGIN
+            {_table_version_bump("Users")}
+        END
+        """
+        for name, event in (("name", "UPDATE OF name"), ("delete", "DELETE"))
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def migrate():
+    """Applies every migration newer than the database's user_version. Safe to run from every worker."""
+    if get_db().execute("PRAGMA user_version").fetchone()[0] >= LATEST_VERSION:
+        return []
+    applied = []
+    for version, description, steps in MIGRATIONS:
+        with immediate_transaction() as conn:
+            # Re-read under the write lock: another worker may have just applied it
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                continue
+            if callable(steps):
+                steps(conn)
+            else:
+                for statement in steps:
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+        applied.append(version)
+        print(f"Applied migration {version}: {description}")
+    return applied
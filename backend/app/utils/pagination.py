@@ -0,0 +1,89 @@
+# app/utils/pagination.py
+"""
+Keyset pagination for list endpoints.
+
+Paging is opt-in: ?limit=N returns at most N rows, and when more remain the
+response carries an opaque X-Next-Cursor header to pass back as ?after=.
+The cursor encodes the sort-key fields of the last row (each model declares
+its page key next to the ORDER BY it belongs to), so every page is an index
+seek rather than an OFFSET walk. Without limit the full list is streamed
+straight from the cursor as a chunked JSON array (utils/json_stream.py).
+"""
+import base64
+import json
+import os
+import itertools
+from flask import jsonify, request
+from .json_stream import json_array_response
+
+PAGE_SIZE_MAX = int(os.environ.get("PAGE_SIZE_MAX", 500))
+
+
+class PageArgsError(ValueError):
+    pass
+
+
+def encode_cursor(item, key_fields):
+    values = [item[field] for field in key_fields]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, key_fields):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise PageArgsError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(key_fields):
+        raise PageArgsError("Invalid cursor")
+    # Values are bound straight into the page query, so only SQLite scalars are accepted
+    if not all(value is None or isinstance(value, (str, int, float)) for value in values):
+        raise PageArgsError("Invalid cursor")
+    return tuple(values)
+
+
+def page_args(key_fields):
+    """Reads limit/after from the query string. Returns (None, None) when the request isn't paged."""
+    limit = request.args.get("limit")
+    after = request.args.get("after")
+    if limit is None:
+        if after is not None:
+            raise PageArgsError("'after' requires 'limit'")
+        return None, None
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise PageArgsError("'limit' must be an integer")
+    if not 1 <= limit <= PAGE_SIZE_MAX:
+        raise PageArgsError(f"'limit' must be between 1 and {PAGE_SIZE_MAX}")
+    return limit, decode_cursor(after, key_fields) if after else None
+
+
+def paginate(fetch, key_fields, empty=None):
+    """
+    Serves one page of fetch(limit, after, stream). Paged requests ask for
+    one extra row to learn whether another page exists; unpaged requests are
+    streamed. empty, if given, is the (body, status) to return when there
+    are no rows at all.
+    """
+    try:
+        limit, after = page_args(key_fields)
+    except PageArgsError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if limit is None:
+        rows = iter(fetch(None, None, True))
+        first = next(rows, None)
+        if first is None:
+            if empty is not None:
+                return jsonify(empty[0]), empty[1]
+            return jsonify([]), 200
+        return json_array_response(itertools.chain((first,), rows))
+
+    items = fetch(limit + 1, after, False)
+    if not items and empty is not None:
+        return jsonify(empty[0]), empty[1]
+    headers = {}
+    if len(items) > limit:
+        items = items[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(items[-1], key_fields)
+    return jsonify(items), 200, headers
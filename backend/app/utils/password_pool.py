@@ -0,0 +1,192 @@
+# app/utils/password_pool.py
+"""
+Runs password hashing and verification in a dedicated process pool so a
+login storm can't pin the request threads that serve /vote/cast. At most
+PASSWORD_POOL_MAX_PENDING jobs may be queued or running at once; beyond that
+callers wait up to PASSWORD_POOL_WAIT_S and then get PasswordPoolBusy.
+PASSWORD_POOL_WORKERS=0 hashes inline on the request thread instead.
+If a worker dies (OOM kill, crash) the pool is rebuilt and the affected
+jobs are rerun once; hashing and verifying have no side effects.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+
+PASSWORD_POOL_WORKERS = int(os.environ.get("PASSWORD_POOL_WORKERS", min(4, os.cpu_count() or 1)))
+PASSWORD_POOL_MAX_PENDING = int(os.environ.get("PASSWORD_POOL_MAX_PENDING", 64))
+PASSWORD_POOL_WAIT_S = float(os.environ.get("PASSWORD_POOL_WAIT_S", 2))
+# Passwords per job when hashing in bulk (user import)
+PASSWORD_POOL_BATCH = int(os.environ.get("PASSWORD_POOL_BATCH", 16))
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the hashing pool is saturated for longer than PASSWORD_POOL_WAIT_S."""
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(1, PASSWORD_POOL_MAX_PENDING))
+
+_stats_lock = threading.Lock()
+_stats = {
+    "hashes": 0,
+    "verifications": 0,
+    "jobs": 0,
+    "rejected": 0,
+    "pool_restarts": 0,
+    "in_flight": 0,
+    "max_in_flight": 0,
+    "latency_ms_total": 0.0,
+    "latency_ms_max": 0.0,
+}
+
+
+def _get_pool():
+    # One pool per process: a gunicorn worker forked from a preloaded master
+    # builds its own on first use.
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid():
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # fork rather than spawn/forkserver: those re-import __main__, and
+            # app.py builds the whole app at import time
+            _pool = ProcessPoolExecutor(PASSWORD_POOL_WORKERS, mp_context=multiprocessing.get_context("fork"))
+            _pool_pid = os.getpid()
+    return _pool
+
+
+def _discard_pool(pool):
+    """Drops a pool that lost a worker, so the next _get_pool() builds a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not pool:
+            return  # another thread already replaced it
+        _pool = None
+    # The broken pool has already terminated its remaining workers
+    pool.shutdown(wait=False, cancel_futures=True)
+    with _stats_lock:
+        _stats["pool_restarts"] += 1
+    print("Password pool lost a worker process; starting a new pool")
+
+
+def start():
+    """Forks the pool workers now, before the app starts its background threads."""
+    if PASSWORD_POOL_WORKERS > 0:
+        _get_pool().submit(os.getpid).result()
+
+
+def _submit(kind, count, func, *args):
+    """Queues func(*args) on the pool and returns its Future; count is the number of passwords it covers."""
+    if not _slots.acquire(timeout=PASSWORD_POOL_WAIT_S):
+        with _stats_lock:
+            _stats["rejected"] += 1
+        raise PasswordPoolBusy("password hashing pool is saturated")
+
+    with _stats_lock:
+        _stats["in_flight"] += 1
+        _stats["max_in_flight"] = max(_stats["max_in_flight"], _stats["in_flight"])
+    started = time.perf_counter()
+
+    def done(_future):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        _slots.release()
+        with _stats_lock:
+            _stats["in_flight"] -= 1
+            _stats[kind] += count
+            _stats["jobs"] += 1
+            _stats["latency_ms_total"] += elapsed_ms
+            _stats["latency_ms_max"] = max(_stats["latency_ms_max"], elapsed_ms)
+
+    if PASSWORD_POOL_WORKERS <= 0:
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+    else:
+        try:
+            pool = _get_pool()
+            try:
+                future = pool.submit(func, *args)
+            except BrokenProcessPool:
+                _discard_pool(pool)
+                future = _get_pool().submit(func, *args)
+        except BaseException:
+            done(None)
+            raise
+    future.add_done_callback(done)
+    return future
+
+
+def _result(future, kind, count, func, *args):
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        # A worker died under the job; the pool is now marked broken, so this
+        # submit rebuilds it
+        return _submit(kind, count, func, *args).result()
+
+
+def _run(kind, func, *args):
+    return _result(_submit(kind, 1, func, *args), kind, 1, func, *args)
+
+
+def hash_password(password):
+    return _run("hashes", generate_password_hash, password)
+
+
+def check_password(password_hash, password):
+    return _run("verifications", check_password_hash, password_hash, password)
+
+
+def _hash_batch(passwords):
+    return [generate_password_hash(password) for password in passwords]
+
+
+def hash_passwords(passwords):
+    """
+    Hashes a list of passwords across the pool in batches of
+    PASSWORD_POOL_BATCH, returning the hashes in order. At most one batch
+    per worker is queued at a time, so logins arriving mid-import wait
+    behind a few batches rather than the whole list.
+    """
+    batches = [passwords[i:i + PASSWORD_POOL_BATCH] for i in range(0, len(passwords), max(1, PASSWORD_POOL_BATCH))]
+    window = max(1, PASSWORD_POOL_WORKERS)
+    pending = deque()
+    hashes = []
+    def collect():
+        future, batch = pending.popleft()
+        hashes.extend(_result(future, "hashes", len(batch), _hash_batch, batch))
+
+    for batch in batches:
+        if len(pending) >= window:
+            collect()
+        pending.append((_submit("hashes", len(batch), _hash_batch, batch), batch))
+    while pending:
+        collect()
+    return hashes
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["workers"] = PASSWORD_POOL_WORKERS
+    stats["max_pending"] = PASSWORD_POOL_MAX_PENDING
+    # Jobs beyond the worker count are waiting in the pool's queue
+    stats["queue_depth"] = max(0, stats["in_flight"] - max(PASSWORD_POOL_WORKERS, 0))
+    stats["avg_latency_ms"] = stats["latency_ms_total"] / stats["jobs"] if stats["jobs"] else 0
+    return stats
+
+
+@atexit.register
+def shutdown():
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,117 @@
+# app/utils/recount.py
+"""
+Recount engine: recomputes every candidate's tally from the append-only
+Ballots table (plus the baseline_votes carried over from before ballots
+were recorded) and reports where it disagrees with Candidates.total_votes.
+
+Elections are split into shards of RECOUNT_SHARD_ELECTIONS consecutive
+election_ids. Each shard is counted on its own read-only connection inside
+a single read transaction, so votes committed mid-audit can't show up as
+mismatches. Shards run on a process pool from the CLI (recount.py); inside
+the app they run on threads instead, since forking a threaded server is
+unsafe and sqlite3 releases the GIL while a query runs.
+"""
+import multiprocessing
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+from . import db
+
+RECOUNT_WORKERS = int(os.environ.get("RECOUNT_WORKERS", os.cpu_count() or 1))
+RECOUNT_SHARD_ELECTIONS = int(os.environ.get("RECOUNT_SHARD_ELECTIONS", 250))
+# Mismatches listed in the report; the rest are only counted
+RECOUNT_MAX_MISMATCHES = int(os.environ.get("RECOUNT_MAX_MISMATCHES", 1000))
+
+
+def _recount_shard(db_path, first_election_id, last_election_id):
+    from ..models.vote_model import count_ballots, get_recorded_tallies
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        conn.execute("BEGIN")
+        ballots = {
+            candidate_id: (election_id, count)
+            for election_id, candidate_id, count in count_ballots(conn, first_election_id, last_election_id)
+        }
+        tallies = get_recorded_tallies(conn, first_election_id, last_election_id)
+        conn.rollback()
+    finally:
+        conn.close()
+
+    ballot_total = sum(count for _, count in ballots.values())
+    mismatches = []
+    elections = set()
+    for candidate_id, election_id, total_votes, baseline_votes in tallies:
+        elections.add(election_id)
+        counted = ballots.pop(candidate_id, (election_id, 0))[1]
+        if baseline_votes + counted != total_votes:
+            mismatches.append({
+                "election_id": election_id,
+                "candidate_id": candidate_id,
+                "total_votes": total_votes,
+                "recounted": baseline_votes + counted,
+                "ballots": counted,
+                "baseline_votes": baseline_votes,
+            })
+    # Ballots left over belong to candidates that no longer exist
+    for candidate_id, (election_id, counted) in ballots.items():
+        mismatches.append({
+            "election_id": election_id,
+            "candidate_id": candidate_id,
+            "total_votes": None,
+            "recounted": counted,
+            "ballots": counted,
+            "baseline_votes": 0,
+        })
+    return {
+        "elections": len(elections),
+        "candidates": len(tallies),
+        "ballots": ballot_total,
+        "mismatches": mismatches,
+    }
+
+
+def _shards(election_ids):
+    if election_ids is not None:
+        return [(election_id, election_id) for election_id in election_ids]
+    from ..models.vote_model import get_election_id_range
+
+    lowest, highest = get_election_id_range(db.get_db())
+    if lowest is None:
+        return []
+    return [
+        (first, min(first + RECOUNT_SHARD_ELECTIONS - 1, highest))
+        for first in range(lowest, highest + 1, RECOUNT_SHARD_ELECTIONS)
+    ]
+
+
+def recount(election_ids=None, processes=False, workers=RECOUNT_WORKERS):
+    """
+    Recounts the given elections (all of them if None) and returns the
+    audit report. processes=True runs shards on a forked process pool,
+    which is only safe from a single-threaded program such as the CLI.
+    """
+    started = time.perf_counter()
+    shards = _shards(election_ids)
+    workers = max(1, min(workers, len(shards) or 1))
+    if processes:
+        executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"))
+    else:
+        executor = ThreadPoolExecutor(workers, thread_name_prefix="recount")
+
+    report = {"elections": 0, "candidates": 0, "ballots": 0, "mismatched_candidates": 0, "mismatches": []}
+    with executor:
+        firsts, lasts = zip(*shards) if shards else ((), ())
+        for shard in executor.map(_recount_shard, repeat(db.DB_PATH), firsts, lasts):
+            for key in ("elections", "candidates", "ballots"):
+                report[key] += shard[key]
+            report["mismatched_candidates"] += len(shard["mismatches"])
+            room = RECOUNT_MAX_MISMATCHES - len(report["mismatches"])
+            report["mismatches"].extend(shard["mismatches"][:max(room, 0)])
+
+    report["shards"] = len(shards)
+    report["workers"] = workers
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return report
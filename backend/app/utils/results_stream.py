@@ -0,0 +1,113 @@
+# app/utils/results_stream.py
+"""
+Fan-out of live tally changes for /election/<id>/results/stream.
+
+Each election with at least one subscriber gets a single watcher thread per
+process. It re-reads the tally (through tally_cache, so normally just one
+TallyVersions lookup) at most once every RESULTS_STREAM_INTERVAL_MS and
+pushes only the candidates whose totals changed to every subscriber.
+A subscriber that falls SUBSCRIBER_BACKLOG events behind is dropped: its
+backlog is replaced by CLOSED, which ends the stream so the client's
+EventSource reconnects and starts again from a fresh snapshot.
+"""
+import os
+import queue
+import threading
+import time
+
+RESULTS_STREAM_INTERVAL_MS = float(os.environ.get("RESULTS_STREAM_INTERVAL_MS", 1000))
+RESULTS_STREAM_HEARTBEAT_S = float(os.environ.get("RESULTS_STREAM_HEARTBEAT_S", 15))
+# A subscriber this far behind is a dead or stalled client; it gets dropped
+SUBSCRIBER_BACKLOG = 32
+
+_lock = threading.Lock()
+_channels = {}  # election_id -> _Channel
+
+# Last item a dropped subscriber receives
+CLOSED = object()
+
+
+class _Channel:
+    def __init__(self, election_id, load_candidates):
+        self.election_id = election_id
+        self.load_candidates = load_candidates
+        self.subscribers = set()
+        self.totals = {}
+        self.thread = threading.Thread(
+            target=self._run, name=f"results-stream-{election_id}", daemon=True
+        )
+
+    def _snapshot(self):
+        return {c["candidate_id"]: c["total_votes"] for c in self.load_candidates(self.election_id)}
+
+    def _run(self):
+        interval = RESULTS_STREAM_INTERVAL_MS / 1000
+        while True:
+            time.sleep(interval)
+            with _lock:
+                if not self.subscribers:
+                    _channels.pop(self.election_id, None)
+                    return
+                subscribers = list(self.subscribers)
+
+            try:
+                totals = self._snapshot()
+            except Exception as e:
+                print(f"Error refreshing results stream {self.election_id}: {e}")
+                continue
+
+            delta = [
+                {"candidate_id": cid, "total_votes": votes}
+                for cid, votes in totals.items()
+                if self.totals.get(cid) != votes
+            ]
+            removed = [cid for cid in self.totals if cid not in totals]
+            self.totals = totals
+            if not delta and not removed:
+                continue
+
+            event = {"election_id": self.election_id, "changed": delta, "removed": removed}
+            for sub in subscribers:
+                try:
+                    sub.put_nowait(event)
+                except queue.Full:
+                    self._drop(sub)
+
+    def _drop(self, sub):
+        with _lock:
+            self.subscribers.discard(sub)
+        # Only this thread puts, so once drained there is room for the marker
+        while True:
+            try:
+                sub.get_nowait()
+            except queue.Empty:
+                break
+        sub.put_nowait(CLOSED)
+
+
+def subscribe(election_id, load_candidates):
+    """
+    Registers a subscriber and returns (queue, initial_candidates). The queue
+    receives delta dicts, or CLOSED if the subscriber was dropped; call
+    unsubscribe() when the client goes away.
+    """
+    sub = queue.Queue(maxsize=SUBSCRIBER_BACKLOG)
+    # Loaded before anything is registered, so a failure leaves no channel without a watcher
+    candidates = load_candidates(election_id)
+    with _lock:
+        channel = _channels.get(election_id)
+        if channel is None:
+            channel = _Channel(election_id, load_candidates)
+            channel.totals = {c["candidate_id"]: c["total_votes"] for c in candidates}
+            channel.thread.start()
+            _channels[election_id] = channel
+        channel.subscribers.add(sub)
+    return sub, candidates
+
+
+def unsubscribe(election_id, sub):
+    with _lock:
+        channel = _channels.get(election_id)
+        if channel:
+            channel.subscribers.discard(sub)
+
@@ -0,0 +1,147 @@
+# app/utils/role_cache.py
+"""
+Per-process read-through cache for authorization lookups: a user's site
+role and their role in each club (None for non-members is cached too).
+
+Triggers append every change to Users.role or ClubMemberships to the
+RoleChanges log. At most every ROLE_RECHECK_MS a worker reads the log past
+the last change_id it has seen and evicts only the keys that changed, so a
+role granted through one gunicorn worker reaches the others without a full
+flush. Writes made by this worker evict their keys immediately.
+
+The same log versions the session claims behind /me: claims carry the
+change_id watermark they were issued at, and are stale only if the log has
+a later site-role change for that user.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from .db import get_db
+
+ROLE_CACHE_MAX_ENTRIES = int(os.environ.get("ROLE_CACHE_MAX_ENTRIES", 50000))
+ROLE_CACHE_TTL_S = float(os.environ.get("ROLE_CACHE_TTL_S", 300))
+ROLE_RECHECK_MS = float(os.environ.get("ROLE_RECHECK_MS", 500))
+# More unseen changes than this and the whole cache is dropped instead
+ROLE_CACHE_MAX_REPLAY = int(os.environ.get("ROLE_CACHE_MAX_REPLAY", 1000))
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # (reg_no, club_id or None) -> (loaded_at, role)
+_seen_change = None       # last RoleChanges.change_id applied
+_checked_at = 0.0
+_evictions = 0            # bumped on every eviction; guards against storing stale loads
+_site_changes = {}        # reg_no -> change_id of the latest site-role change in the log
+_log_floor = 0            # changes at or below this id may have been pruned from the log
+
+
+def _evict(keys):
+    global _evictions
+    with _lock:
+        for key in keys:
+            _entries.pop(key, None)
+        _evictions += 1
+
+
+def _clear(conn):
+    """Drops every cached role and rebuilds the site-role change index from the log."""
+    global _evictions, _seen_change, _site_changes, _log_floor
+    oldest, latest = conn.execute(
+        "SELECT (SELECT MIN(change_id) FROM RoleChanges), (SELECT MAX(change_id) FROM RoleChanges)"
+    ).fetchone()
+    site_changes = dict(conn.execute(
+        "SELECT reg_no, MAX(change_id) FROM RoleChanges WHERE club_id IS NULL GROUP BY reg_no"
+    ).fetchall())
+    with _lock:
+        _entries.clear()
+        _evictions += 1
+        _seen_change = latest or 0
+        _site_changes = site_changes
+        _log_floor = oldest - 1 if oldest else 0
+
+
+def _sync():
+    global _checked_at, _seen_change
+    now = time.monotonic()
+    with _lock:
+        if (now - _checked_at) * 1000 < ROLE_RECHECK_MS:
+            return
+        # Claim the check so concurrent requests don't all hit the log
+        _checked_at = now
+        since = _seen_change
+
+    conn = get_db()
+    if since is None:
+        _clear(conn)
+        return
+
+    changes = conn.execute(
+        "SELECT change_id, reg_no, club_id FROM RoleChanges WHERE change_id > ? ORDER BY change_id LIMIT ?",
+        (since, ROLE_CACHE_MAX_REPLAY + 1),
+    ).fetchall()
+    if not changes:
+        return
+    if len(changes) > ROLE_CACHE_MAX_REPLAY:
+        _clear(conn)
+        return
+    _evict([(row[1], row[2]) for row in changes])
+    with _lock:
+        for change_id, reg_no, club_id in changes:
+            if club_id is None:
+                _site_changes[reg_no] = change_id
+        _seen_change = max(_seen_change or 0, changes[-1][0])
+
+
+def _get(key, load):
+    _sync()
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+        if entry and now - entry[0] < ROLE_CACHE_TTL_S:
+            _entries.move_to_end(key)
+            return entry[1]
+        evictions = _evictions
+
+    role = load()
+    with _lock:
+        # Skip the store if anything was evicted while we were loading: the
+        # row we read may already be outdated
+        if _evictions == evictions:
+            _entries[key] = (now, role)
+            _entries.move_to_end(key)
+            while len(_entries) > ROLE_CACHE_MAX_ENTRIES:
+                _entries.popitem(last=False)
+    return role
+
+
+def get_site_role(reg_no, load):
+    """Users.role for reg_no; load() reads it from SQLite on a miss."""
+    return _get((reg_no, None), load)
+
+
+def get_member_role(reg_no, club_id, load):
+    """Approved membership role of reg_no in club_id, or None; load() reads it on a miss."""
+    try:
+        # Request payloads may carry "3" where the change log has 3
+        key = (reg_no, int(club_id))
+    except (TypeError, ValueError):
+        return load()
+    return _get(key, load)
+
+
+def invalidate(reg_no, club_id=None):
+    """Drops one cached role after a local write (club_id=None means the site role)."""
+    _evict([(reg_no, None if club_id is None else int(club_id))])
+
+
+def claims_version():
+    """Watermark to stamp on freshly read session claims. Read it before reading the user row."""
+    _sync()
+    with _lock:
+        return _seen_change or 0
+
+
+def claims_stale(reg_no, version):
+    """True if reg_no's site role may have changed after claims stamped with version were issued."""
+    _sync()
+    with _lock:
+        return version < _log_floor or _site_changes.get(reg_no, 0) > version
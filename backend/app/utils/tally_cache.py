@@ -0,0 +1,95 @@
+# app/utils/tally_cache.py
+"""
+Per-process cache of each election's candidate list, kept sorted by votes.
+
+Every change to Candidates bumps TallyVersions.version (via triggers), so a
+worker only has to compare one integer to know whether its copy is current.
+Within TALLY_RECHECK_MS of the last check the list is served without
+touching SQLite at all. Votes recorded by this worker are applied in place.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+TALLY_RECHECK_MS = float(os.environ.get("TALLY_RECHECK_MS", 250))
+TALLY_CACHE_MAX_ELECTIONS = int(os.environ.get("TALLY_CACHE_MAX_ELECTIONS", 256))
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # election_id -> _ElectionTally
+
+
+class _ElectionTally:
+    __slots__ = ("version", "candidates", "checked_at")
+
+    def __init__(self, version, candidates):
+        self.version = version
+        # Sorted snapshot; replaced wholesale on change, never mutated
+        self.candidates = candidates
+        self.checked_at = time.monotonic()
+
+
+def _sort(candidates):
+    return sorted(candidates, key=lambda c: (-c["total_votes"], c["candidate_id"]))
+
+
+def get_sorted_candidates(election_id, read_version, load_candidates):
+    """
+    Returns the cached candidate list for an election. read_version() must
+    return the current TallyVersions value; load_candidates() the rows from
+    SQLite. Either is only called when the cache can't answer on its own.
+    """
+    with _lock:
+        entry = _entries.get(election_id)
+        if entry and (time.monotonic() - entry.checked_at) * 1000 < TALLY_RECHECK_MS:
+            _entries.move_to_end(election_id)
+            return entry.candidates
+
+    # Read the version before the rows: a concurrent write can only make us
+    # reload once more, never keep stale rows under a newer version.
+    version = read_version(election_id)
+    if entry and entry.version == version:
+        with _lock:
+            entry.checked_at = time.monotonic()
+        return entry.candidates
+
+    entry = _ElectionTally(version, _sort(load_candidates(election_id)))
+    with _lock:
+        current = _entries.get(election_id)
+        if current is None or current.version <= version:
+            _entries[election_id] = entry
+            _entries.move_to_end(election_id)
+            while len(_entries) > TALLY_CACHE_MAX_ELECTIONS:
+                _entries.popitem(last=False)
+    return entry.candidates
+
+
+def record_vote(election_id, candidate_id, new_version):
+    """
+    Applies a committed vote to the cached list. new_version is the
+    TallyVersions value right after that vote; if the cache missed any other
+    change in between it is dropped instead of patched.
+    """
+    with _lock:
+        entry = _entries.get(election_id)
+        if entry is None:
+            return
+        if entry.version != new_version - 1:
+            del _entries[election_id]
+            return
+        updated = []
+        for candidate in entry.candidates:
+            if candidate["candidate_id"] == candidate_id:
+                candidate = dict(candidate, total_votes=candidate["total_votes"] + 1)
+            updated.append(candidate)
+        entry.candidates = _sort(updated)
+        entry.version = new_version
+        entry.checked_at = time.monotonic()
+
+
+def invalidate(election_id=None):
+    with _lock:
+        if election_id is None:
+            _entries.clear()
+        else:
+            _entries.pop(election_id, None)
@@ -0,0 +1,130 @@
+# app/utils/vote_batcher.py
+"""
+Optional group-commit stage for /vote/cast. Request threads enqueue ballots
+and block; a single writer thread drains the queue into one transaction
+every VOTE_BATCH_MAX_DELAY_MS (or every VOTE_BATCH_SIZE ballots) and wakes
+each request only after its batch has committed.
+"""
+import os
+import queue
+import threading
+import time
+from .db import get_db
+
+VOTE_BATCHING = os.environ.get("VOTE_BATCHING", "0") == "1"
+VOTE_BATCH_SIZE = int(os.environ.get("VOTE_BATCH_SIZE", 64))
+VOTE_BATCH_MAX_DELAY_MS = float(os.environ.get("VOTE_BATCH_MAX_DELAY_MS", 5))
+
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats = {
+    "batches": 0,
+    "ballots": 0,
+    "failed_batches": 0,
+    "max_batch_fill": 0,
+    "commit_ms_total": 0.0,
+    "commit_ms_max": 0.0,
+}
+
+
+class _PendingBallot:
+    __slots__ = ("ballot", "done", "outcome", "error")
+
+    def __init__(self, ballot):
+        self.ballot = ballot
+        self.done = threading.Event()
+        self.outcome = None
+        self.error = None
+
+
+def _collect_batch():
+    batch = [_queue.get()]
+    deadline = time.monotonic() + VOTE_BATCH_MAX_DELAY_MS / 1000
+    while len(batch) < VOTE_BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _record_stats(fill, commit_ms, failed):
+    with _stats_lock:
+        if failed:
+            _stats["failed_batches"] += 1
+            return
+        _stats["batches"] += 1
+        _stats["ballots"] += fill
+        _stats["max_batch_fill"] = max(_stats["max_batch_fill"], fill)
+        _stats["commit_ms_total"] += commit_ms
+        _stats["commit_ms_max"] = max(_stats["commit_ms_max"], commit_ms)
+
+
+def _writer_loop():
+    from ..models.vote_model import cast_votes_batch
+
+    # Acknowledgements promise durability, so the writer fsyncs every commit;
+    # batching is what keeps that affordable.
+    get_db().execute("PRAGMA synchronous = FULL")
+
+    while True:
+        batch = _collect_batch()
+        started = time.perf_counter()
+        try:
+            outcomes = cast_votes_batch([p.ballot for p in batch])
+        except Exception as e:
+            print("error in vote batch:", e)
+            _record_stats(len(batch), 0, failed=True)
+            for pending in batch:
+                pending.error = e
+                pending.done.set()
+            continue
+
+        _record_stats(len(batch), (time.perf_counter() - started) * 1000, failed=False)
+        for pending, outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                print("error in ballot:", outcome)
+                pending.error = outcome
+            else:
+                pending.outcome = outcome
+            pending.done.set()
+
+
+def _ensure_writer():
+    # Started lazily so each gunicorn worker gets its own thread after fork
+    global _writer
+    if _writer is not None and _writer.is_alive():
+        return
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, name="vote-batcher", daemon=True)
+            _writer.start()
+
+
+def submit_vote(reg_no, election_id, candidate_id):
+    """Queues a ballot and blocks until its batch is committed. Returns the cast_vote outcome."""
+    _ensure_writer()
+    pending = _PendingBallot((reg_no, election_id, candidate_id))
+    _queue.put(pending)
+    pending.done.wait()
+    if pending.error is not None:
+        raise pending.error
+    return pending.outcome
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["enabled"] = VOTE_BATCHING
+    stats["queue_depth"] = _queue.qsize()
+    stats["batch_size_limit"] = VOTE_BATCH_SIZE
+    stats["batch_max_delay_ms"] = VOTE_BATCH_MAX_DELAY_MS
+    stats["avg_batch_fill"] = stats["ballots"] / stats["batches"] if stats["batches"] else 0
+    stats["avg_commit_ms"] = stats["commit_ms_total"] / stats["batches"] if stats["batches"] else 0
+    return stats
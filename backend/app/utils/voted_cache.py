@@ -0,0 +1,44 @@
+# app/utils/voted_cache.py
+"""
+Small per-process LRU of reg_no -> set of election_ids the user has voted in.
+
+Entries are filled by one indexed query per user and extended in place when
+this worker records a vote. VOTED_CACHE_TTL_S bounds how long a vote cast
+through another worker can go unseen; the Votes UNIQUE constraint still
+rejects a second ballot in that window.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+VOTED_CACHE_MAX_USERS = int(os.environ.get("VOTED_CACHE_MAX_USERS", 10000))
+VOTED_CACHE_TTL_S = float(os.environ.get("VOTED_CACHE_TTL_S", 30))
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # reg_no -> (loaded_at, frozenset of election_ids)
+
+
+def get_voted_elections(reg_no, load_voted):
+    """Returns the cached voted set for reg_no, loading it with load_voted(reg_no) on a miss."""
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(reg_no)
+        if entry and now - entry[0] < VOTED_CACHE_TTL_S:
+            _entries.move_to_end(reg_no)
+            return entry[1]
+
+    voted = frozenset(load_voted(reg_no))
+    with _lock:
+        _entries[reg_no] = (now, voted)
+        _entries.move_to_end(reg_no)
+        while len(_entries) > VOTED_CACHE_MAX_USERS:
+            _entries.popitem(last=False)
+    return voted
+
+
+def record_vote(reg_no, election_id):
+    with _lock:
+        entry = _entries.get(reg_no)
+        if entry:
+            _entries[reg_no] = (entry[0], entry[1] | {election_id})
@@ -0,0 +1,246 @@
+"""
+EXPLAIN QUERY PLAN regression check for every SQL statement in app/models.
+
+Builds a throwaway database with a generated dataset, runs every public
+model function while tracing the SQL it issues, and fails if any statement
+scans a table or index without a seek key, or sorts in a temp B-tree,
+unless that call is on an allowlist below. Exits non-zero on failure so it
+can gate CI.
+
+    python check_query_plans.py [--users N] [--verbose]
+"""
+import argparse
+import inspect
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+
+from app.utils import db
+from generate_data import generate
+
+# Unpaged listings, which return every row they visit, so walking the whole
+# table (or its ordering index) is their cost by design. Keyed by (model
+# function, call args); the paged calls of the same functions must seek.
+ALLOWED_SCANS = {
+    ("get_all_clubs", ()): "lists every club",
+    ("get_all_positions", ()): "lists every position",
+    ("get_all_elections", ()): "lists every election",
+    ("get_elections_by_status", ("completed",)): "lists every completed election",
+}
+
+# Temp B-tree sorts over a set an index seek has already bounded. Keyed by
+# (model function, status argument).
+ALLOWED_SORTS = {
+    ("get_elections_by_status", "ongoing"): "seeks on end_epoch, then sorts only the open elections",
+}
+
+
+def call_specs(conn):
+    """
+    One entry per public model function: (module, function, args). Every
+    function found in app/models must appear here, so a new query can't
+    slip past the check. args=None marks functions that issue no SQL.
+    """
+    admin = conn.execute("SELECT reg_no FROM Users WHERE role = 'admin' LIMIT 1").fetchone()[0]
+    member = conn.execute("SELECT reg_no, club_id, membership_id FROM ClubMemberships WHERE status = 'approved' LIMIT 1").fetchone()
+    candidate = conn.execute("SELECT candidate_id, election_id, reg_no FROM Candidates LIMIT 1").fetchone()
+    # An open election with a candidate and an eligible voter, so cast_vote runs its writes
+    ballot = conn.execute("""
+        SELECT m.reg_no, e.election_id, c.candidate_id
+        FROM Elections e
+        JOIN Candidates c ON c.election_id = e.election_id
+        JOIN ClubMemberships m ON m.club_id = e.club_id AND m.status = 'approved'
+        WHERE e.start_epoch <= :now AND e.end_epoch > :now AND e.election_id != :skip
+        LIMIT 2
+    """, {"now": int(time.time()), "skip": candidate["election_id"]}).fetchall()
+    completed = conn.execute(
+        "SELECT election_id FROM Elections WHERE status = 'completed' AND end_epoch <= ? LIMIT 1", (int(time.time()),)
+    ).fetchone()[0]
+    return [
+        ("candidate_model", "create_candidate", (candidate["election_id"], admin, "plan check")),
+        ("candidate_model", "get_tally_version", (candidate["election_id"],)),
+        ("candidate_model", "get_candidates_by_election", (candidate["election_id"],)),
+        ("candidate_model", "query_candidates_by_election", (candidate["election_id"],)),
+        ("candidate_model", "get_candidate_by_candidate_id", (candidate["candidate_id"],)),
+        ("candidate_model", "get_single_candidate", (candidate["election_id"], candidate["reg_no"])),
+        ("candidate_model", "increment_vote", (candidate["candidate_id"],)),
+        ("candidate_model", "delete_candidate", (candidate["candidate_id"],)),
+        ("club_model", "get_all_clubs", ()),
+        ("club_model", "get_all_clubs", (20, (member["club_id"],))),
+        ("club_model", "get_single_club", (member["club_id"],)),
+        ("election_model", "create_election", (member["club_id"], 1, admin, "2030-01-01T00:00", "2030-01-02T00:00")),
+        ("election_model", "get_all_elections", ()),
+        ("election_model", "get_all_elections", (20, ("2026-01-01T00:00", 10 ** 9))),
+        ("election_model", "get_elections_by_status", ("completed", 20, ("2026-01-01T00:00", 10 ** 9))),
+        ("election_model", "get_elections_by_club", (member["club_id"], 20, ("2026-01-01T00:00", 10 ** 9))),
+        ("election_model", "get_elections_by_status", ("upcoming",)),
+        ("election_model", "get_elections_by_status", ("ongoing",)),
+        ("election_model", "get_elections_by_status", ("ongoing", 20, ("2026-01-01T00:00", 10 ** 9))),
+        ("election_model", "get_elections_by_status", ("completed",)),
+        ("election_model", "get_election_by_id", (candidate["election_id"],)),
+        ("election_model", "get_elections_by_club", (member["club_id"],)),
+        ("election_model", "update_election_status", (candidate["election_id"], "completed")),
+        ("election_model", "sync_election_statuses", ()),
+        ("election_model", "get_election_window", (candidate["election_id"],)),
+        ("election_model", "get_club_id_of_election", (candidate["election_id"],)),
+        ("election_model", "delete_election", (candidate["election_id"],)),
+        ("lease_model", "try_acquire_lease", ("plan_check", "checker", time.time(), 5)),
+        ("lease_model", "release_lease", ("plan_check", "checker")),
+        ("member_model", "add_membership", (admin, member["club_id"])),
+        ("member_model", "get_joined_clubs_of_users", (member["reg_no"],)),
+        ("member_model", "get_joined_clubs_of_users", (member["reg_no"], 20, (0,))),
+        ("member_model", "get_all_clubs_of_users", (member["reg_no"],)),
+        ("member_model", "get_all_clubs_of_users", (member["reg_no"], 20, (0,))),
+        ("member_model", "get_approved_members_of_club", (member["club_id"],)),
+        ("member_model", "get_approved_members_of_club", (member["club_id"], 20, (member["membership_id"],))),
+        ("member_model", "count_approved_members", (member["club_id"],)),
+        ("member_model", "update_membership_status", (member["reg_no"], member["club_id"], "approved")),
+        ("member_model", "update_member_role", (member["membership_id"], "Member")),
+        ("member_model", "update_membership_statuses", ([(member["reg_no"], member["club_id"], "approved"),
+                                                         (admin, member["club_id"], "approved"),
+                                                         ("NOSUCHUSER", 1, "approved")],)),
+        ("member_model", "resolve_pending_memberships", (member["club_id"], "approved")),
+        ("member_model", "get_member_role", (member["reg_no"], member["club_id"])),
+        ("member_model", "get_clubs_headed_by_user", (member["reg_no"],)),
+        ("member_model", "get_clubs_headed_by_user", (member["reg_no"], 20, (0,))),
+        ("member_model", "get_pending_requests", ()),
+        ("member_model", "get_pending_requests", (20, ("2026-01-01 00:00:00", 10 ** 9))),
+        ("position_model", "get_all_positions", ()),
+        ("position_model", "get_position_by_id", (1,)),
+        ("user_model", "add_user", ("PLANCHECK1", "pw", "Plan Check")),
+        ("results_model", "compute_results", (completed,)),
+        ("results_model", "declare_results", (completed,)),
+        ("results_model", "get_results_snapshot", (completed,)),
+        ("results_model", "declare_pending_results", (None, 5)),
+        ("turnout_model", "get_vote_buckets", (completed, 60, 0, 2 ** 40)),
+        ("turnout_model", "get_vote_buckets", (completed, 3600, 0, 2 ** 40)),
+        ("turnout_model", "get_club_election_votes", (member["club_id"],)),
+        ("user_model", "add_users", ([("PLANCHECK2", "hash", "Plan Check"), (member["reg_no"], "hash", "Existing")],)),
+        ("user_model", "find_existing_reg_nos", ([member["reg_no"], "PLANCHECK2", "NOSUCHUSER"],)),
+        ("user_model", "get_user_by_reg_no", (member["reg_no"],)),
+        ("user_model", "verify_password", None),
+        ("user_model", "get_user_role", (member["reg_no"],)),
+        ("vote_model", "add_vote_record", ("PLANCHECK1", 5)),
+        ("vote_model", "check_vote", (member["reg_no"], 5)),
+        ("vote_model", "get_voted_election_ids", (member["reg_no"],)),
+        ("vote_model", "check_votes", None),
+        ("vote_model", "apply_ballot", None),  # exercised by cast_vote
+        ("vote_model", "cast_vote", tuple(ballot[0])),
+        ("vote_model", "cast_votes_batch", ([tuple(ballot[1])],)),
+        ("vote_model", "get_election_id_range", (conn,)),
+        ("vote_model", "count_ballots", (conn, 1, 250)),
+        ("vote_model", "get_recorded_tallies", (conn, 1, 250)),
+    ]
+
+
+def model_functions():
+    import importlib
+    import pkgutil
+    import app.models as models
+
+    found = set()
+    for info in pkgutil.iter_modules(models.__path__):
+        module = importlib.import_module(f"app.models.{info.name}")
+        for name, obj in inspect.getmembers(module, inspect.isfunction):
+            if obj.__module__ == module.__name__ and not name.startswith("_"):
+                found.add((info.name, name))
+    return found
+
+
+def _scans_materialized(sql, detail, materialized):
+    # The plan names the alias ("SCAN r"), so map it back through the FROM clause
+    alias = detail.split()[1]
+    return alias in materialized or any(
+        re.search(rf"\b{re.escape(name)}\s+(?:AS\s+)?{re.escape(alias)}\b", sql, re.IGNORECASE)
+        for name in materialized
+    )
+
+
+def plan_problems(conn, sql):
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+    details = [row[3] for row in rows]
+    scans = []
+    sorts = []
+    # CTEs built from VALUES hold the caller's own rows; scanning them is fine
+    materialized = set()
+    for detail in details:
+        if detail.startswith("MATERIALIZE "):
+            materialized.add(detail.split()[1])
+        # Any SCAN has no seek key: with or without an index it visits every row
+        if detail.startswith("SCAN ") and "CONSTANT ROW" not in detail:
+            if not _scans_materialized(sql, detail, materialized):
+                scans.append(detail)
+        # A range with only an upper bound ("(start_epoch<?)") walks from the
+        # oldest row; without a LIMIT to stop it that is a scan of the history
+        if detail.startswith("SEARCH ") and re.search(r"\(\w+<\?\)", detail) and not re.search(r"\bLIMIT\b", sql, re.IGNORECASE):
+            scans.append(detail)
+        if "USE TEMP B-TREE" in detail:
+            sorts.append(detail)
+    return scans, sorts, details
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--clubs", type=int, default=200)
+    parser.add_argument("--elections", type=int, default=2000)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="plancheck-")
+    path = os.path.join(tmpdir, "plans.db")
+    print(f"Generating dataset in {path} ...")
+    generate(path, args.users, args.clubs, args.elections, verbose=False)
+
+    import importlib
+    conn = db.get_db()
+    specs = call_specs(conn)
+
+    missing = model_functions() - {(module, name) for module, name, _ in specs}
+    failures = [f"{module}.{name}: no plan check registered" for module, name in sorted(missing)]
+
+    explain_conn = sqlite3.connect(path)
+    for module_name, func_name, call_args in specs:
+        if call_args is None:
+            continue
+        func = getattr(importlib.import_module(f"app.models.{module_name}"), func_name)
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            func(*call_args)
+        finally:
+            conn.set_trace_callback(None)
+
+        # Trigger programs re-report their parent statement; check each once
+        for sql in dict.fromkeys(statements):
+            keyword = sql.lstrip().split(None, 1)[0].upper()
+            if keyword not in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH"):
+                continue
+            scans, sorts, details = plan_problems(explain_conn, sql)
+            problems = []
+            if not any(func_name == name and call_args == args for name, args in ALLOWED_SCANS):
+                problems += scans
+            if not any(func_name == name and call_args[:1] == (arg,) for name, arg in ALLOWED_SORTS):
+                problems += sorts
+            label = f"{module_name}.{func_name}"
+            if args.verbose or problems:
+                print(f"\n{label}\n  " + " ".join(sql.split())[:160])
+                for detail in details:
+                    print(f"    {detail}")
+            if problems:
+                failures.append(f"{label}: " + "; ".join(problems))
+
+    print()
+    if failures:
+        print("Query plan check FAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print(f"Query plan check passed ({len(specs)} model calls).")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,9 @@
 # mycur.execute("CREATE TABLE IF NOT EXISTS Users(reg_no char(10)  primary key,password text not null,name varchar(25) not null)")
 # mycon.commit()
 # mycon.close()
-from app.models.user_model import create_user_table
-from app.models.club_model import create_clubs_table
-from app.models.member_model import create_memberships_table
+from app.utils.migrations import migrate, LATEST_VERSION
 
 if __name__ == "__main__":
-    create_user_table()
-    create_clubs_table()
-    create_memberships_table()
-    print("Database initialized successfully.")
+    applied = migrate()
+    print(f"Applied migrations: {applied or 'none'}")
+    print(f"Database initialized successfully at schema version {LATEST_VERSION}.")
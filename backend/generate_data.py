@@ -0,0 +1,209 @@
+"""
+Generates a realistic scale dataset on the current schema.
+
+    python generate_data.py --db scale.db                     # 100k users, 1k clubs, 10k elections
+    python generate_data.py --db big.db --elections 30000     # a few million votes
+
+Every generated user has the same password (--password, default
+"password123") so the load driver can log them in. Candidate totals match
+the generated Votes and Ballots rows, and voted_at falls inside each
+election's window.
+"""
+import argparse
+import os
+import random
+import time
+
+from werkzeug.security import generate_password_hash
+
+from app.utils import db
+
+FIRST_NAMES = ["Arjun", "Meera", "Rahul", "Anjali", "Hari", "Nivedita", "Joel", "Fathima", "Gopi", "Sneha",
+               "Adithya", "Lakshmi", "Aman", "Diya", "Vishnu", "Riya", "Kiran", "Neha", "Sanjay", "Ammu"]
+LAST_NAMES = ["K", "Nair", "Menon", "George", "Thomas", "Pillai", "Varghese", "Das", "Kumar", "Joseph"]
+CLUB_TOPICS = ["Coding", "Robotics", "Literary", "Music", "Drama", "Photography", "Quiz", "Debate", "Sports",
+               "Environment", "Astronomy", "Entrepreneurship", "Design", "Dance", "Film", "Chess"]
+POSITIONS = ["President", "Vice President", "Secretary", "Treasurer", "Event Coordinator", "Technical Head"]
+
+CHUNK = 50000
+
+
+def _iso(epoch):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(epoch))
+
+
+def _reg_no(i):
+    # Same 10-character shape as real register numbers (CHAR(10))
+    return f"GEN{i:07d}"
+
+
+def _chunks(rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate(path, users=100000, clubs=1000, elections=10000, clubs_per_user=3.0,
+             password="password123", seed=42, ongoing_share=0.05, verbose=True):
+    """Creates (or extends) the database at path with a generated dataset. Returns row counts."""
+    log = print if verbose else (lambda *a, **k: None)
+    db.DB_PATH = path
+    from app.utils.migrations import migrate
+    migrate()
+
+    rnd = random.Random(seed)
+    conn = db.get_db()
+    # Bulk load: durability doesn't matter until the final commit
+    conn.execute("PRAGMA synchronous = OFF")
+    now = int(time.time())
+    counts = {}
+
+    password_hash = generate_password_hash(password)
+    reg_nos = [_reg_no(i) for i in range(users)]
+    log(f"Users: {users}")
+    for chunk in _chunks(
+        (reg_no, password_hash, f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}",
+         _iso(now - rnd.randrange(2 * 365 * 86400)), "admin" if i < max(1, users // 20000) else "user")
+        for i, reg_no in enumerate(reg_nos)
+    ):
+        conn.executemany(
+            "INSERT OR IGNORE INTO Users (reg_no, password, name, created_at, role) VALUES (?, ?, ?, ?, ?)", chunk
+        )
+    counts["users"] = users
+
+    conn.executemany("INSERT OR IGNORE INTO Positions (position_name) VALUES (?)", [(p,) for p in POSITIONS])
+    position_ids = [row[0] for row in conn.execute("SELECT position_id FROM Positions")]
+
+    log(f"Clubs: {clubs}")
+    first_club = (conn.execute("SELECT MAX(club_id) FROM Clubs").fetchone()[0] or 0) + 1
+    club_ids = list(range(first_club, first_club + clubs))
+    conn.executemany(
+        "INSERT INTO Clubs (club_id, name, description, logo_url) VALUES (?, ?, ?, ?)",
+        [(c, f"{CLUB_TOPICS[c % len(CLUB_TOPICS)]} Club {c}", "Generated club",
+          f"https://example.com/logos/{c}.png") for c in club_ids],
+    )
+    conn.commit()
+
+    # Club popularity is skewed: a few clubs get most of the members
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(clubs)]
+    approved_by_club = {c: [] for c in club_ids}
+    memberships = []
+    for reg_no in reg_nos:
+        joined = set(rnd.choices(club_ids, weights, k=max(1, int(rnd.expovariate(1 / clubs_per_user)))))
+        for club_id in joined:
+            status = rnd.choices(("approved", "pending", "rejected"), (85, 10, 5))[0]
+            memberships.append((reg_no, club_id, status, _iso(now - rnd.randrange(365 * 86400))))
+            if status == "approved":
+                approved_by_club[club_id].append(reg_no)
+    heads = {c: members[0] for c, members in approved_by_club.items() if members}
+    log(f"Memberships: {len(memberships)}")
+    for chunk in _chunks(
+        (reg_no, club_id, "Head" if heads.get(club_id) == reg_no else "Member", status, join_date)
+        for reg_no, club_id, status, join_date in memberships
+    ):
+        conn.executemany(
+            "INSERT OR IGNORE INTO ClubMemberships (reg_no, club_id, role, status, join_date) VALUES (?, ?, ?, ?, ?)",
+            chunk,
+        )
+    conn.executemany("UPDATE Clubs SET head_id = ? WHERE club_id = ?", [(h, c) for c, h in heads.items()])
+    counts["memberships"] = len(memberships)
+    conn.commit()
+
+    log(f"Elections: {elections}")
+    eligible_clubs = [c for c in club_ids if len(approved_by_club[c]) >= 2]
+    first_election = (conn.execute("SELECT MAX(election_id) FROM Elections").fetchone()[0] or 0) + 1
+    election_rows, candidate_rows, vote_rows, ballot_rows = [], [], [], []
+    for election_id in range(first_election, first_election + elections):
+        club_id = rnd.choice(eligible_clubs)
+        members = approved_by_club[club_id]
+        if rnd.random() < ongoing_share:
+            # Keep a slice of elections open right now so there is live voting traffic to drive
+            start = now - rnd.randrange(1, 86400)
+        else:
+            start = now + rnd.randrange(-365 * 86400, 30 * 86400)
+        end = start + rnd.choice((1, 2, 3)) * 86400
+        status = "upcoming" if start > now else ("ongoing" if end > now else "completed")
+        election_rows.append((election_id, club_id, rnd.choice(position_ids), _iso(start), _iso(end), status,
+                              heads.get(club_id, members[0])))
+
+        nominees = rnd.sample(members, min(len(members), rnd.randint(2, 5)))
+        tallies = [0] * len(nominees)
+        if start <= now:
+            # Votes arrive front-loaded after opening, within the window that has elapsed so far
+            window = min(end, now) - start
+            turnout = rnd.uniform(0.2, 0.7)
+            popularity = [rnd.random() + 0.1 for _ in nominees]
+            for voter in rnd.sample(members, int(len(members) * turnout)):
+                choice = rnd.choices(range(len(nominees)), popularity)[0]
+                tallies[choice] += 1
+                vote_rows.append((voter, election_id, _iso(start + int(window * rnd.random() ** 2))))
+                ballot_rows.append((election_id, nominees[choice]))
+        candidate_rows.extend(
+            (election_id, reg_no, f"Manifesto of {reg_no}", votes) for reg_no, votes in zip(nominees, tallies)
+        )
+
+    for chunk in _chunks(election_rows):
+        conn.executemany(
+            "INSERT INTO Elections (election_id, club_id, position_id, start_time, end_time, status, created_by) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            chunk,
+        )
+    for chunk in _chunks(candidate_rows):
+        conn.executemany(
+            "INSERT OR IGNORE INTO Candidates (election_id, reg_no, manifesto, total_votes) VALUES (?, ?, ?, ?)", chunk
+        )
+    conn.commit()
+    counts["elections"] = len(election_rows)
+    counts["candidates"] = len(candidate_rows)
+
+    log(f"Votes: {len(vote_rows)}")
+    for i, chunk in enumerate(_chunks(vote_rows)):
+        conn.executemany("INSERT OR IGNORE INTO Votes (reg_no, election_id, voted_at) VALUES (?, ?, ?)", chunk)
+        if verbose and i % 10 == 9:
+            log(f"  {min((i + 1) * CHUNK, len(vote_rows))}/{len(vote_rows)}")
+    counts["votes"] = len(vote_rows)
+    conn.commit()
+
+    log(f"Ballots: {len(ballot_rows)}")
+    candidate_ids = {
+        (election_id, reg_no): candidate_id
+        for candidate_id, election_id, reg_no in conn.execute(
+            "SELECT candidate_id, election_id, reg_no FROM Candidates WHERE election_id >= ?", (first_election,)
+        )
+    }
+    for chunk in _chunks((election_id, candidate_ids[election_id, reg_no]) for election_id, reg_no in ballot_rows):
+        conn.executemany("INSERT INTO Ballots (election_id, candidate_id) VALUES (?, ?)", chunk)
+    counts["ballots"] = len(ballot_rows)
+    conn.commit()
+
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="database file to create or extend (never defaults to the app DB)")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--clubs", type=int, default=1000)
+    parser.add_argument("--elections", type=int, default=10000)
+    parser.add_argument("--clubs-per-user", type=float, default=3.0)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ongoing-share", type=float, default=0.05, help="fraction of elections open right now")
+    args = parser.parse_args()
+
+    started = time.time()
+    counts = generate(os.path.abspath(args.db), args.users, args.clubs, args.elections,
+                      args.clubs_per_user, args.password, args.seed, args.ongoing_share)
+    print(f"Generated {counts} in {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Registers a batch of users from a CSV of reg_no,name,password (a header row
+is optional), e.g. a new intake:
+
+    python import_users.py intake.csv                 # into Voting_System.db
+    python import_users.py intake.csv --db scale.db
+
+Existing reg_nos are skipped. Passwords are hashed across the password pool
+(PASSWORD_POOL_WORKERS processes) and rows are committed a chunk at a time,
+so an interrupted import can simply be re-run.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+from app.utils import db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv", help="CSV file to import, or - for stdin")
+    parser.add_argument("--db", help="database file (defaults to the app DB)")
+    args = parser.parse_args()
+
+    if args.db:
+        db.DB_PATH = os.path.abspath(args.db)
+    from app.utils import password_pool
+    from app.utils.migrations import migrate
+    from app.services.auth_service import import_users
+    migrate()
+    password_pool.start()
+
+    started = time.time()
+    source = sys.stdin if args.csv == "-" else open(args.csv, encoding="utf-8-sig", newline="")
+    with source:
+        for totals in import_users(csv.reader(source)):
+            elapsed = time.time() - started
+            rate = totals["imported"] / elapsed if elapsed else 0
+            print(f"{totals['processed']} rows: {totals['imported']} imported, {totals['skipped']} skipped, "
+                  f"{totals['invalid']} invalid ({rate:.0f} users/s)", file=sys.stderr)
+
+    for error in totals["errors"]:
+        print(f"  line {error['line']}: {error['error']}", file=sys.stderr)
+    print(f"Imported {totals['imported']} users in {time.time() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+HTTP load driver for the Flask app. Replays traffic mixes against a running
+server and reports throughput plus p50/p95/p99 latency per route.
+
+    python generate_data.py --db scale.db
+    # start the app on scale.db, then:
+    python load_test.py --db scale.db --scenario login_storm --concurrency 50 --requests 5000
+    python load_test.py --db scale.db --scenario mixed --duration 60
+
+Scenarios:
+    login_storm      everyone logs in at once (POST /auth/login, then GET /me)
+    election_open    eligible members of ongoing elections check status and vote
+    results_polling  voters refresh candidate lists and election pages
+    mixed            weighted blend of the above plus club browsing
+
+--db is only read to plan realistic traffic (register numbers, ongoing
+elections and their eligible voters); requests go over HTTP only.
+"""
+import argparse
+import http.cookiejar
+import json
+import random
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Client:
+    """One simulated user: its own cookie jar, so session cookies stick."""
+
+    def __init__(self, base_url, recorder):
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, method, path, route, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+        started = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=30) as resp:
+                resp.read()
+                status = resp.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            status = e.code
+        except Exception as e:
+            status = type(e).__name__
+        self.recorder.record(f"{method} {route}", time.perf_counter() - started, status)
+        return status
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, route, seconds, status):
+        with self._lock:
+            self.latencies[route].append(seconds)
+            self.statuses[route][status] += 1
+
+    def report(self, elapsed):
+        total = sum(len(v) for v in self.latencies.values())
+        print(f"\n{total} requests in {elapsed:.1f}s -> {total / elapsed:.1f} req/s\n")
+        print(f"{'route':<42} {'count':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  statuses")
+        for route in sorted(self.latencies):
+            samples = sorted(self.latencies[route])
+            statuses = " ".join(f"{k}:{v}" for k, v in sorted(self.statuses[route].items(), key=str))
+            print(f"{route:<42} {len(samples):>7} {len(samples) / elapsed:>8.1f} "
+                  f"{_pct(samples, 50):>8.1f} {_pct(samples, 95):>8.1f} {_pct(samples, 99):>8.1f} "
+                  f"{samples[-1] * 1000:>8.1f}  {statuses}")
+
+
+def _pct(samples, p):
+    index = min(len(samples) - 1, max(0, round(p / 100 * len(samples)) - 1))
+    return samples[index] * 1000
+
+
+def plan_traffic(db_path):
+    """Reads register numbers and open ballots from the database to aim requests at real rows."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    now = int(time.time())
+    users = [row[0] for row in conn.execute("SELECT reg_no FROM Users WHERE reg_no LIKE 'GEN%'")]
+    clubs = [row[0] for row in conn.execute("SELECT club_id FROM Clubs")]
+    elections = [row[0] for row in conn.execute("SELECT election_id FROM Elections")]
+    ongoing = [row[0] for row in conn.execute(
+        "SELECT election_id FROM Elections WHERE start_epoch <= ? AND end_epoch > ?", (now, now)
+    )]
+    # (voter, election, candidate) for members who haven't voted yet
+    ballots = [tuple(row) for row in conn.execute("""
+        SELECT m.reg_no, e.election_id,
+               (SELECT candidate_id FROM Candidates c WHERE c.election_id = e.election_id
+                ORDER BY random() LIMIT 1)
+        FROM Elections e
+        JOIN ClubMemberships m ON m.club_id = e.club_id AND m.status = 'approved'
+        WHERE e.start_epoch <= :now AND e.end_epoch > :now
+          AND NOT EXISTS (SELECT 1 FROM Votes v WHERE v.reg_no = m.reg_no AND v.election_id = e.election_id)
+    """, {"now": now})]
+    conn.close()
+    ballots = [b for b in ballots if b[2] is not None]
+    if not users:
+        raise SystemExit("No generated users (GEN...) found; run generate_data.py first.")
+    return {"users": users, "clubs": clubs, "elections": elections, "ongoing": ongoing or elections, "ballots": ballots}
+
+
+def login_storm(client, plan, rnd, password):
+    reg_no = rnd.choice(plan["users"])
+    client.request("POST", "/auth/login", "/auth/login", {"reg_no": reg_no, "password": password})
+    client.request("GET", "/me", "/me")
+    client.request("GET", f"/user/{reg_no}/clubs", "/user/<reg_no>/clubs")
+
+
+def election_open(client, plan, rnd, password):
+    if not plan["ballots"]:
+        return results_polling(client, plan, rnd, password)
+    with plan["lock"]:
+        reg_no, election_id, candidate_id = plan["ballots"].pop() if plan["ballots"] else rnd.choice(plan["spent"])
+        plan["spent"].append((reg_no, election_id, candidate_id))
+    client.request("GET", f"/election/{election_id}/candidates", "/election/<id>/candidates")
+    client.request("GET", f"/vote/check/{election_id}/{reg_no}", "/vote/check/<id>/<reg_no>")
+    client.request("POST", f"/vote/cast/{election_id}", "/vote/cast/<id>",
+                   {"reg_no": reg_no, "candidate_id": candidate_id})
+
+
+def results_polling(client, plan, rnd, password):
+    election_id = rnd.choice(plan["ongoing"])
+    client.request("GET", f"/election/{election_id}/candidates", "/election/<id>/candidates")
+    client.request("GET", f"/election/{election_id}", "/election/<id>")
+    client.request("GET", "/election/status/ongoing", "/election/status/<status>")
+
+
+def browse(client, plan, rnd, password):
+    reg_no = rnd.choice(plan["users"])
+    club_id = rnd.choice(plan["clubs"])
+    client.request("GET", "/club/all", "/club/all")
+    client.request("GET", f"/club/{club_id}", "/club/<id>")
+    client.request("GET", f"/election/club/{club_id}", "/election/club/<id>")
+    client.request("GET", f"/user/{reg_no}/memberships", "/user/<reg_no>/memberships")
+
+
+def mixed(client, plan, rnd, password):
+    scenario = rnd.choices((login_storm, election_open, results_polling, browse), (10, 20, 50, 20))[0]
+    scenario(client, plan, rnd, password)
+
+
+SCENARIOS = {
+    "login_storm": login_storm,
+    "election_open": election_open,
+    "results_polling": results_polling,
+    "mixed": mixed,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--db", required=True, help="database the server is running on (read-only, for planning)")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="mixed")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000, help="scenario iterations (ignored with --duration)")
+    parser.add_argument("--duration", type=float, help="run for this many seconds instead of a fixed count")
+    parser.add_argument("--password", default="password123", help="password given to generate_data.py")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    plan = plan_traffic(args.db)
+    plan["lock"] = threading.Lock()
+    plan["spent"] = []
+    random.Random(args.seed).shuffle(plan["ballots"])
+    print(f"Planned traffic: {len(plan['users'])} users, {len(plan['ongoing'])} ongoing elections, "
+          f"{len(plan['ballots'])} open ballots")
+
+    recorder = Recorder()
+    scenario = SCENARIOS[args.scenario]
+    deadline = time.monotonic() + args.duration if args.duration else None
+    counter = iter(range(args.requests))
+    counter_lock = threading.Lock()
+
+    def worker(worker_id):
+        rnd = random.Random(args.seed * 1000 + worker_id)
+        client = Client(args.base_url, recorder)
+        while True:
+            if deadline is not None:
+                if time.monotonic() >= deadline:
+                    return
+            else:
+                with counter_lock:
+                    if next(counter, None) is None:
+                        return
+            scenario(client, plan, rnd, args.password)
+
+    print(f"Running {args.scenario} with {args.concurrency} workers against {args.base_url} ...")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        for future in [pool.submit(worker, i) for i in range(args.concurrency)]:
+            future.result()
+    recorder.report(time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Audits every election's tally: recounts Candidates.total_votes from the
+Ballots table across a process pool and lists any disagreement.
+
+    python recount.py                       # the app DB, all elections
+    python recount.py --db scale.db --workers 8
+    python recount.py --election 42 --election 43
+
+Exits non-zero if any tally doesn't match, so it can run from cron or CI.
+"""
+import argparse
+import os
+import sys
+
+from app.utils import db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help="database file (defaults to the app DB)")
+    parser.add_argument("--election", type=int, action="append", help="recount only this election (repeatable)")
+    parser.add_argument("--workers", type=int, help="worker processes (default RECOUNT_WORKERS)")
+    args = parser.parse_args()
+
+    if args.db:
+        db.DB_PATH = os.path.abspath(args.db)
+    from app.utils import recount
+    from app.utils.migrations import migrate
+    migrate()
+
+    report = recount.recount(args.election, processes=True, workers=args.workers or recount.RECOUNT_WORKERS)
+    print(f"Recounted {report['ballots']} ballots for {report['candidates']} candidates in "
+          f"{report['elections']} elections ({report['shards']} shards, {report['workers']} workers) "
+          f"in {report['elapsed_ms'] / 1000:.2f}s")
+    for row in report["mismatches"]:
+        recorded = "no such candidate" if row["total_votes"] is None else f"total_votes {row['total_votes']}"
+        print(f"  election {row['election_id']} candidate {row['candidate_id']}: {recorded}, "
+              f"recounted {row['recounted']} ({row['ballots']} ballots + {row['baseline_votes']} baseline)")
+    if report["mismatched_candidates"]:
+        print(f"MISMATCH: {report['mismatched_candidates']} candidate tallies disagree with their ballots")
+        sys.exit(1)
+    print("All tallies match their ballots.")
+
+
+if __name__ == "__main__":
+    main()
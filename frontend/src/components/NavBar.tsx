@@ -60,6 +60,28 @@ const NavBar = () => {
         }
     };
 
+    // Approve/reject every listed request in one call
+    const handleBulkAction = async (status: 'approved' | 'rejected') => {
+        const items = pendingRequests.map(r => ({ reg_no: r.reg_no, club_id: r.club_id, status }));
+        try {
+            const res = await fetch("http://127.0.0.1:5000/club/memberships/status", {
+                method: "PATCH",
+                headers: { 'Content-Type': 'application/json' },
+                credentials: "include",
+                body: JSON.stringify({ admin: state.user?.reg_no, items })
+            });
+            if (res.ok) {
+                const data = await res.json();
+                const done = new Set(data.results.filter((r: any) => r.result === 'updated').map((r: any) => `${r.club_id}:${r.reg_no}`));
+                setPendingRequests(prev => prev.filter(r => !done.has(`${r.club_id}:${r.reg_no}`)));
+            } else {
+                alert("Failed to update status");
+            }
+        } catch (err) {
+            alert("Network error");
+        }
+    };
+
     // Get user data from context
     const user = state.user;
 
@@ -147,6 +169,21 @@ const NavBar = () => {
                         ) : pendingRequests.length === 0 ? (
                             <div className="text-gray-400">No pending requests.</div>
                         ) : (
+                            <>
+                            <div className="flex justify-end space-x-2 mb-3">
+                                <button
+                                    className="bg-green-500 hover:bg-green-600 text-white px-3 py-1 rounded-md text-sm font-semibold"
+                                    onClick={() => handleBulkAction('approved')}
+                                >
+                                    Approve all
+                                </button>
+                                <button
+                                    className="bg-red-500 hover:bg-red-600 text-white px-3 py-1 rounded-md text-sm font-semibold"
+                                    onClick={() => handleBulkAction('rejected')}
+                                >
+                                    Reject all
+                                </button>
+                            </div>
                             <ul className="divide-y divide-gray-700 max-h-80 overflow-y-auto">
                                 {pendingRequests.map((req, idx) => (
                                     <li key={req.membership_id || idx} className="py-3 flex items-center justify-between">
@@ -174,6 +211,7 @@ const NavBar = () => {
                                     </li>
                                 ))}
                             </ul>
+                            </>
                         )}
                     </div>
                 </div>
@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
-import { checkVoteStatus } from '../services/candidateService';
+import { checkVoteStatuses } from '../services/candidateService';
 
 interface HomeElection {
   election_id: number;
@@ -38,6 +38,12 @@ const Home = () => {
         if (response.ok) {
           const electionsData = await response.json();
           
+          // Check vote status for all ongoing elections in one request
+          const ongoingIds = electionsData
+            .filter((election: any) => election.status === 'ongoing')
+            .map((election: any) => election.election_id);
+          const voteStatuses = user?.reg_no ? await checkVoteStatuses(user.reg_no, ongoingIds) : {};
+
           // Process elections and add vote status and candidate count
           const processedElections = await Promise.all(
             electionsData
@@ -66,11 +72,7 @@ const Home = () => {
                   totalVotes = candidates.reduce((sum: number, candidate: any) => sum + (candidate.total_votes || 0), 0);
                 }
 
-                // Check if user has voted (only for ongoing elections)
-                let hasVoted = false;
-                if (election.status === 'ongoing' && user?.reg_no) {
-                  hasVoted = await checkVoteStatus(user.reg_no, election.election_id);
-                }
+                const hasVoted = voteStatuses[election.election_id] || false;
 
                 return {
                   election_id: election.election_id,
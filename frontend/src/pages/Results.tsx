@@ -69,20 +69,20 @@ const Results: React.FC = () => {
 
       const electionData = await electionResponse.json();
 
-      // Fetch candidates with vote counts
-      const candidatesResponse = await fetch(`http://127.0.0.1:5000/election/${electionId}/candidates`, {
+      // Fetch ranked results (a stored snapshot once the election has been declared)
+      const resultsResponse = await fetch(`http://127.0.0.1:5000/election/${electionId}/results`, {
         credentials: 'include'
       });
 
-      if (!candidatesResponse.ok) {
-        throw new Error('Failed to fetch candidates');
+      if (!resultsResponse.ok) {
+        throw new Error('Failed to fetch results');
       }
 
-      const candidatesData = await candidatesResponse.json();
+      const resultsData = await resultsResponse.json();
 
-      // Process results
-      const totalVotes = candidatesData.reduce((sum: number, candidate: Candidate) => sum + candidate.total_votes, 0);
-      const sortedCandidates = candidatesData.sort((a: Candidate, b: Candidate) => b.total_votes - a.total_votes);
+      // Candidates arrive sorted by votes
+      const totalVotes = resultsData.votes_cast;
+      const sortedCandidates: Candidate[] = resultsData.candidates;
       const winner = sortedCandidates.length > 0 && sortedCandidates[0].total_votes > 0 ? sortedCandidates[0] : null;
 
       setResults({
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../contexts/AuthContext';
-import { fetchCandidatesForElection, submitVote, checkVoteStatus } from '../services/candidateService';
+import { fetchCandidatesForElection, submitVote, checkVoteStatuses } from '../services/candidateService';
 
 interface Candidate {
   candidate_id: number;
@@ -227,19 +227,6 @@ const Voting = () => {
     return fetchCandidatesForElection(electionId);
   };
 
-  // Check if user has voted in a specific election
-  const checkUserVoteStatus = async (electionId: number): Promise<boolean> => {
-    if (!user?.reg_no) return false;
-    
-    try {
-      // Use the service function to check vote status
-      return await checkVoteStatus(user.reg_no, electionId);
-    } catch (error) {
-      console.error(`Error checking vote status for election ${electionId}:`, error);
-      return false;
-    }
-  };
-
   // Fetch elections from backend API
   useEffect(() => {
     const fetchElections = async () => {
@@ -257,17 +244,18 @@ const Voting = () => {
         if (response.ok) {
           const electionsData: Election[] = await response.json();
           
+          // Only check vote status for ongoing elections, all in one request
+          const ongoingIds = electionsData
+            .filter((election) => election.status === 'ongoing')
+            .map((election) => election.election_id);
+          const voteStatuses = await checkVoteStatuses(user!.reg_no, ongoingIds);
+
           // Elections are already sorted by the backend service
-          // Fetch candidates for each election and check vote status
+          // Fetch candidates for each election
           const processedElections = await Promise.all(
             electionsData.map(async (election) => {
               const candidates = await fetchCandidates(election.election_id);
-              
-              // Only check vote status for ongoing elections
-              let hasVoted = false;
-              if (election.status === 'ongoing') {
-                hasVoted = await checkUserVoteStatus(election.election_id);
-              }
+              const hasVoted = voteStatuses[election.election_id] || false;
               
               const totalVotes = candidates.reduce((sum, candidate) => sum + (candidate.total_votes || 0), 0);
               
@@ -146,4 +146,71 @@ export const checkVoteStatus = async (regNo: string, electionId: number): Promis
     // On error, assume not voted to allow user to try
     return false;
   }
-};
\ No newline at end of file
+};
+
+export interface ResultsDelta {
+  election_id: number;
+  changed: { candidate_id: number; total_votes: number }[];
+  removed: number[];
+}
+
+/**
+ * Subscribe to live results for an election over Server-Sent Events
+ * @param electionId - The election ID
+ * @param onSnapshot - Called with the full candidate list on (re)connect
+ * @param onDelta - Called with changed vote totals
+ * @returns Function that closes the stream
+ */
+export const subscribeToElectionResults = (
+  electionId: number,
+  onSnapshot: (candidates: Candidate[]) => void,
+  onDelta: (delta: ResultsDelta) => void
+): (() => void) => {
+  const source = new EventSource(`${API_BASE_URL}/election/${electionId}/results/stream`, {
+    withCredentials: true,
+  });
+
+  source.addEventListener('snapshot', (event) => {
+    onSnapshot(JSON.parse((event as MessageEvent).data));
+  });
+  source.addEventListener('delta', (event) => {
+    onDelta(JSON.parse((event as MessageEvent).data));
+  });
+  source.onerror = () => {
+    console.error(`Results stream for election ${electionId} interrupted, retrying`);
+  };
+
+  return () => source.close();
+};
+
+/**
+ * Check vote status for many elections in one request
+ * @param regNo - User registration number
+ * @param electionIds - The election IDs to check
+ * @returns Promise with a map of election ID to vote status
+ */
+export const checkVoteStatuses = async (regNo: string, electionIds: number[]): Promise<Record<number, boolean>> => {
+  if (electionIds.length === 0) return {};
+
+  try {
+    const url = `${API_BASE_URL}/vote/check/${regNo}?election_ids=${electionIds.join(',')}`;
+
+    const response = await fetch(url, {
+      method: 'GET',
+      credentials: 'include',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+    });
+
+    if (response.ok) {
+      const result = await response.json();
+      return result.has_voted || {};
+    }
+    // On failure, assume not voted to allow user to try
+    return {};
+  } catch (error) {
+    console.error(`Error checking vote statuses:`, error);
+    return {};
+  }
+};